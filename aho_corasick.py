@@ -0,0 +1,64 @@
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self, patterns=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+
+    def add(self, pattern, value):
+        if not pattern:
+            return
+        if self._built:
+            raise RuntimeError("Cannot add patterns after the automaton is built")
+
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._out[state] = self._out[state] + ((len(pattern), value),)
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Fold the suffix state's outputs in so matching never walks fail links
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def iter(self, text):
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for length, value in out[state]:
+                    yield end - length + 1, end + 1, value
+
+    def values(self, text):
+        return [value for _, _, value in self.iter(text)]
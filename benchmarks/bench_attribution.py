@@ -0,0 +1,72 @@
+import argparse
+import logging
+import random
+import time
+
+import skin_data
+from benchmarks.synthetic_wiki import CHAMPIONS, random_date, skin_names
+from champion_registry import ChampionSnapshot
+
+
+def synthetic_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for name in skin_names(count, seed=seed):
+        champion = next((c for c in CHAMPIONS if c in name), rng.choice(CHAMPIONS))
+        date = random_date(rng) if rng.random() < 0.9 else "Unknown"
+        rows.append(skin_data.SkinRow(name, date, date if date != "Unknown" else None, None, champion))
+    return rows
+
+
+def legacy_lookups(skin_rows, champion_skins):
+    # The two scans build_skins_data ran before the name index: a full-table rescan per
+    # champion x special case, and an any() over every champion's list for each row
+    found = 0
+    for champion in champion_skins:
+        for skin_name in skin_data.SPECIAL_CASES:
+            full_skin_name = f"{skin_name} {champion}"
+            for skin_row in skin_rows:
+                table_skin_name = skin_row.name
+                if table_skin_name == full_skin_name or (skin_name in table_skin_name and champion in table_skin_name):
+                    if skin_row.date_text and skin_row.date_text != "Unknown":
+                        found += 1
+                        break
+
+    for skin_row in skin_rows:
+        for champion, skins in champion_skins.items():
+            if any(skin['name'] == skin_row.name for skin in skins):
+                found += 1
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build_skins_data scaling: legacy rescans vs name index")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000, 10000, 50000])
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help="Skip the legacy scans above this many rows (they are quadratic)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    registry = ChampionSnapshot(CHAMPIONS, version=1)
+
+    print(f"{'rows':>8}  {'build_skins_data':>18}  {'per row':>10}  {'legacy scans':>14}")
+    for size in args.sizes:
+        skin_rows = synthetic_rows(size)
+
+        start = time.perf_counter()
+        champion_skins = skin_data.build_skins_data(skin_rows, registry)
+        build_time = time.perf_counter() - start
+
+        legacy = "skipped"
+        if size <= args.legacy_max:
+            start = time.perf_counter()
+            legacy_lookups(skin_rows, champion_skins)
+            legacy = f"{(time.perf_counter() - start) * 1000:11.1f} ms"
+
+        print(f"{size:8d}  {build_time * 1000:15.1f} ms  {build_time / size * 1e6:7.1f} us  {legacy:>14}")
+
+
+if __name__ == '__main__':
+    main()
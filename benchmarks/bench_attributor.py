@@ -0,0 +1,118 @@
+import argparse
+import logging
+import random
+import string
+import time
+
+import skin_data
+from benchmarks.synthetic_wiki import CHAMPIONS, OTHER_SKINS, SKIN_LINES
+from champion_registry import ChampionSnapshot
+
+
+def legacy_attribute(skin_row, registry):
+    # The per-row chain build_skins_data ran before the attribution engine
+    skin_name = skin_row.name
+    skin_champion = None
+
+    if skin_row.champion_cell in registry.name_set:
+        skin_champion = skin_row.champion_cell
+
+    champion_nicknames = {
+        "Emumu": "Amumu", "MF": "Miss Fortune", "TF": "Twisted Fate", "ASol": "Aurelion Sol",
+        "Cass": "Cassiopeia", "Mundo": "Dr. Mundo", "Fiddle": "Fiddlesticks", "GP": "Gangplank",
+        "J4": "Jarvan IV", "Kai": "Kai'Sa", "Kass": "Kassadin", "Kat": "Katarina", "Malph": "Malphite",
+        "Yi": "Master Yi", "Morde": "Mordekaiser", "Nunu": "Nunu & Willump", "Raka": "Soraka",
+        "Tahm": "Tahm Kench", "Vlad": "Vladimir", "Xin": "Xin Zhao"
+    }
+
+    if not skin_champion:
+        for champion in registry.longest_first:
+            if champion in skin_name or f"{champion}'s" in skin_name:
+                skin_champion = champion
+                break
+
+        partial_name_mappings = {
+            "urf": "Warwick", "urfwick": "Warwick", "alien": "Heimerdinger", "definitely not": "Blitzcrank",
+            "festive": "Maokai", "beemo": "Teemo", "pug'maw": "Kog'Maw", "baron": "Nashor", "poro": "Braum",
+            "arcade": "Various", "project": "Various", "cosmic": "Various", "dark star": "Various",
+            "pool party": "Various", "guardian": "Various"
+        }
+
+        if not skin_champion:
+            skin_lower = skin_name.lower()
+            for partial, champ in partial_name_mappings.items():
+                if partial in skin_lower and champ != "Various":
+                    skin_champion = champ
+                    break
+
+        if not skin_champion:
+            for part in skin_name.split():
+                if part in champion_nicknames:
+                    skin_champion = champion_nicknames[part]
+                    break
+
+        if not skin_champion:
+            for special_skin, champ in skin_data.SPECIAL_CASES.items():
+                if special_skin in skin_name and champ != "Various":
+                    skin_champion = champ
+                    break
+
+    return skin_champion
+
+
+def champion_names(count, seed=0):
+    # The real roster, padded with invented names to model a larger champion list
+    rng = random.Random(seed)
+    names = list(CHAMPIONS[:count])
+    while len(names) < count:
+        names.append(rng.choice(string.ascii_uppercase) + ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))))
+    return names
+
+
+def skin_rows(names, count, seed=0):
+    # Rows without a usable champion cell, so attribution has to search the skin name
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            name = f"{rng.choice(SKIN_LINES)} {rng.choice(names)}"
+        else:
+            name = rng.choice(OTHER_SKINS)
+        rows.append(skin_data.SkinRow(name, "Unknown", None, None, None))
+    return rows
+
+
+def per_row(func, rows, registry):
+    start = time.perf_counter()
+    results = [func(row, registry) for row in rows]
+    return results, (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row skin attribution cost as the champion list grows")
+    parser.add_argument('--champions', type=int, nargs='+', default=[40, 170, 500, 1000])
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{'champions':>9}  {'legacy chain':>14}  {'engine':>10}  {'engine build':>13}  {'speedup':>8}")
+    for count in args.champions:
+        names = champion_names(count)
+        registry = ChampionSnapshot(names, version=count)
+        rows = skin_rows(names, args.rows)
+
+        expected, legacy_time = per_row(legacy_attribute, rows, registry)
+
+        start = time.perf_counter()
+        skin_data.get_skin_attributor(registry)
+        build_time = time.perf_counter() - start
+        actual, engine_time = per_row(skin_data._attribute_skin, rows, registry)
+
+        status = "" if expected == actual else "  MISMATCH"
+        print(f"{count:9d}  {legacy_time * 1e6:11.1f} us  {engine_time * 1e6:7.1f} us  {build_time * 1000:10.1f} ms  "
+              f"{legacy_time / engine_time:7.1f}x{status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import logging
+import time
+
+import patch_data
+from benchmarks.synthetic_wiki import CHAMPIONS, patch_history_page
+
+
+def _is_ability_line(change):
+    return ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive'))
+
+
+def legacy_every(changes, keywords, hints):
+    # Shape of the old all-changes predicates: lower, split and rescan the keyword list per call
+    if not changes:
+        return False
+    for change in changes:
+        change_lower = change.lower()
+        if _is_ability_line(change):
+            continue
+        if not any(keyword in change_lower for keyword in keywords) or not any(hint in change_lower for hint in hints):
+            return False
+    return True
+
+
+def legacy_any(changes, keywords, hints):
+    if not changes:
+        return False
+    for change in changes:
+        change_lower = change.lower()
+        if _is_ability_line(change):
+            continue
+        if any(keyword in change_lower for keyword in keywords) and any(hint in change_lower for hint in hints):
+            return True
+    return False
+
+
+def legacy_predicates(version, changes):
+    pd = patch_data
+    return (
+        legacy_every(changes, pd.bug_fix_keywords, ('',)),
+        legacy_any(changes, pd.undocumented_keywords, ('',)),
+        legacy_any(changes, pd.hud_keywords, ('icon', 'hud', 'ui')),
+        legacy_every(changes, pd.tooltip_keywords, ('tooltip', 'text', 'description')),
+        legacy_any(changes, pd.item_keywords, ('recommend', 'item')),
+        legacy_every(changes, pd.splash_keywords, ('splash', 'art', 'portrait', 'loading screen')),
+        legacy_every(changes, pd.animation_keywords, ('animation', 'visual', 'effect', 'vfx', 'particle')),
+        legacy_every(changes, pd.model_texture_keywords, ('model', 'texture', 'visual')),
+        any(keyword in version.lower() for keyword in pd.game_mode_keywords) or (
+            bool(changes) and all(any(keyword in change.lower() for keyword in pd.game_mode_keywords)
+                                  for change in changes)),
+    )
+
+
+def classifier_predicates(version, changes):
+    pd = patch_data
+    return (
+        pd.is_bug_fix_only(changes),
+        pd.is_undocumented(changes),
+        pd.is_ability_icon_hud(changes),
+        pd.is_tooltip_update(changes),
+        pd.is_recommended_items_update(changes),
+        pd.is_splash_artwork_update(changes),
+        pd.is_animation_update(changes),
+        pd.is_model_texture_update(changes),
+        pd.is_game_mode_related(version, changes),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-predicate keyword scans vs the compiled change classifier")
+    parser.add_argument('--champions', type=int, default=len(CHAMPIONS))
+    parser.add_argument('--patches', type=int, default=150, help="Entries per synthetic patch history")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    histories = [
+        patch_data.parse_patch_history(patch_history_page(args.patches, seed=i).encode('utf-8'))
+        for i in range(args.champions)
+    ]
+    patches = [(version, list(changes)) for history in histories for version, changes in history]
+    lines = sum(len(changes) for _, changes in patches)
+
+    start = time.perf_counter()
+    expected = [legacy_predicates(version, changes) for version, changes in patches]
+    legacy_time = time.perf_counter() - start
+
+    patch_data.classify_change.cache_clear()
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        actual = [classifier_predicates(version, changes) for version, changes in patches]
+        timings.append(time.perf_counter() - start)
+    cold_time, warm_time = timings
+
+    mismatches = sum(old != new for old, new in zip(expected, actual))
+
+    print(f"{len(patches)} patches, {lines} change lines, 9 predicates each, "
+          f"{len(patch_data._change_classifier)} classifier keywords")
+    print(f"legacy keyword scans   {legacy_time * 1000:9.1f} ms")
+    print(f"classifier, cold       {cold_time * 1000:9.1f} ms  ({legacy_time / cold_time:5.1f}x)")
+    print(f"classifier, memoized   {warm_time * 1000:9.1f} ms  ({legacy_time / warm_time:5.1f}x)")
+    print(f"mismatches             {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
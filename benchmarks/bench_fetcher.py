@@ -0,0 +1,77 @@
+import argparse
+import logging
+import tempfile
+import time
+
+import requests
+
+import disk_cache
+import fetcher
+import patch_data
+from benchmarks.stub_server import StubWikiServer
+
+
+def season_page(season_index, rows=25):
+    body = ['<table class="sortable article-table"><tr><th>Version</th><th>Date</th></tr>']
+    for i in range(rows):
+        body.append(f"<tr><td>V{season_index}.{i + 1}</td><td>{i + 1:02d}-Jan-2020</td></tr>")
+    body.append('</table>')
+    return ''.join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start wall time of sequential vs concurrent season fetches")
+    parser.add_argument('--latency', type=float, default=0.2, help="Injected per-request latency in seconds")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    paths = [f"/Patch/Season_{i}" for i in range(len(patch_data.SEASON_URLS))]
+    pages = {path: season_page(i) for i, path in enumerate(paths)}
+
+    with StubWikiServer(pages, latency=args.latency) as server:
+        urls = [server.url(path) for path in paths]
+
+        sequential = []
+        concurrent = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for url in urls:
+                requests.get(url, timeout=10)
+            sequential.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            fetcher.fetch_all(urls)
+            concurrent.append(time.perf_counter() - start)
+
+        # End-to-end cold start of get_patch_dates against the stub
+        cold_starts = []
+        original_urls = patch_data.SEASON_URLS
+        original_current = patch_data.CURRENT_SEASON_URL
+        original_cache_dir = disk_cache.CACHE_DIR
+        try:
+            patch_data.SEASON_URLS = urls
+            patch_data.CURRENT_SEASON_URL = urls[0]
+            for _ in range(args.repeat):
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    disk_cache.CACHE_DIR = cache_dir
+                    patch_data.reset_caches()
+                    start = time.perf_counter()
+                    dates = patch_data.get_patch_dates()
+                    cold_starts.append(time.perf_counter() - start)
+        finally:
+            patch_data.SEASON_URLS = original_urls
+            patch_data.CURRENT_SEASON_URL = original_current
+            disk_cache.CACHE_DIR = original_cache_dir
+            patch_data.reset_caches()
+
+    print(f"{len(urls)} pages, {args.latency * 1000:.0f} ms latency, "
+          f"{fetcher.MAX_WORKERS} workers, {fetcher.PER_HOST_LIMIT} per host")
+    print(f"sequential requests.get    best {min(sequential) * 1000:8.1f} ms")
+    print(f"fetcher.fetch_all          best {min(concurrent) * 1000:8.1f} ms")
+    print(f"get_patch_dates cold start best {min(cold_starts) * 1000:8.1f} ms ({len(dates)} versions)")
+
+
+if __name__ == '__main__':
+    main()
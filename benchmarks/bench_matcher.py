@@ -0,0 +1,89 @@
+import argparse
+import logging
+import re
+import time
+
+import skin_data
+from benchmarks.synthetic_wiki import CHAMPIONS, OTHER_SKINS, skin_names
+from champion_registry import ChampionSnapshot
+
+
+def legacy_matches(skin_name, champions):
+    # The per-champion scan find_potential_champion_matches used before the matcher index
+    matches = []
+    skin_lower = skin_name.lower()
+
+    clean_skin_name = skin_lower
+    for prefix in skin_data.MATCH_COMMON_PREFIXES:
+        if clean_skin_name.startswith(prefix):
+            clean_skin_name = clean_skin_name[len(prefix):]
+            break
+
+    for champion in champions:
+        champion_lower = champion.lower()
+        score = 0
+
+        if champion_lower in clean_skin_name:
+            if re.search(r'\b' + re.escape(champion_lower) + r'\b', clean_skin_name):
+                score += 10
+            else:
+                score += 5
+
+        for word in champion_lower.split():
+            if len(word) > 2 and word in clean_skin_name:
+                score += 3
+
+        if champion_lower.replace("'", "").replace(" ", "") in clean_skin_name.replace(" ", ""):
+            score += 2
+
+        for nickname, champ in skin_data.MATCH_NICKNAMES.items():
+            if nickname in skin_lower and champ == champion_lower:
+                score += 5
+
+        if any(pattern in skin_lower for pattern in [f"{champion_lower.replace(' ', '')}",
+                                                  f"{champion_lower[:4]}"]):
+            score += 3
+
+        if score > 0:
+            matches.append((champion, score))
+
+    return sorted(matches, key=lambda x: x[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy per-champion scan vs compiled champion matcher")
+    parser.add_argument('--skins', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    snapshot = ChampionSnapshot(CHAMPIONS, version=1)
+    champions = list(snapshot.names)
+    names = OTHER_SKINS + skin_names(args.skins)
+
+    start = time.perf_counter()
+    expected = [legacy_matches(name, champions) for name in names]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = skin_data.ChampionMatcher(snapshot, skin_data.MATCH_NICKNAMES, skin_data.MATCH_COMMON_PREFIXES)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = matcher.score_many(names)
+    matcher_time = time.perf_counter() - start
+
+    mismatches = [name for name, old, new in zip(names, expected, actual) if old != new]
+
+    print(f"{len(names)} skin names, {len(champions)} champions")
+    print(f"legacy scan       {legacy_time * 1000:9.1f} ms  ({legacy_time / len(names) * 1e6:7.1f} us/skin)")
+    print(f"matcher build     {build_time * 1000:9.1f} ms")
+    print(f"matcher score     {matcher_time * 1000:9.1f} ms  ({matcher_time / len(names) * 1e6:7.1f} us/skin)")
+    print(f"speedup           {legacy_time / matcher_time:9.1f}x")
+    print(f"mismatches        {len(mismatches)}")
+    for name in mismatches[:10]:
+        print(f"  {name!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import random
+import re
+import time
+
+import patch_data
+
+NUMERIC_WORDS = ['damage', 'health', 'mana', 'cooldown', 'range', 'speed', 'armor', 'resist']
+
+
+def legacy_verdicts(change):
+    # Both regex cascades get_patch_data ran per change before the detector
+    numeric = bool(
+        re.search(r'\d+\s*/\s*\d+', change) or
+        re.search(r'(\d+).*from.*(\d+)', change) or
+        re.search(r'(\d+).*to.*(\d+)', change) or
+        re.search(r'(\d+)[%]', change) or
+        re.search(r'(\d+\.?\d*)[\s]*[+-]', change) or
+        (re.search(r'\b\d+\.?\d*\b', change) and any(keyword in change.lower() for keyword in NUMERIC_WORDS)))
+
+    change_lower = change.lower()
+    stat = bool(
+        re.search(r'\d+\s*/\s*\d+', change) or
+        re.search(r'(\d+).*from.*(\d+)', change) or
+        re.search(r'(\d+).*to.*(\d+)', change) or
+        'increased' in change_lower or 'decreased' in change_lower or 'reduced' in change_lower or
+        ('added' in change_lower and 'added to the game' not in change_lower) or
+        (any(word in change_lower for word in ('bonus', 'cooldown', 'damage', 'mana')) and re.search(r'\d+', change)))
+    return numeric, stat
+
+
+def detector_verdicts(change):
+    # Bypasses the lru_cache so every call pays for a full scan
+    mask = patch_data.classify_change.__wrapped__(change)
+    return bool(mask & patch_data.NUMERIC_VALUE), bool(mask & patch_data.STAT_CHANGE)
+
+
+def ability_description(numbers, rng):
+    # Number-heavy ability text with neither "from" nor "to", the worst case for .*WORD.*
+    parts = []
+    for _ in range(numbers):
+        parts.append(f"{rng.randint(1, 400)} ({rng.randint(1, 9)}{rng.choice(['', '0', '5'])} AP ratio) magic")
+    return "R - Ability: Deals " + ", ".join(parts) + " over the duration."
+
+
+def timed(func, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(line) for line in lines]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regex cascade vs compiled numeric detector on long change lines")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200, 800],
+                        help="Numbers per synthetic ability description")
+    parser.add_argument('--lines', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = random.Random(0)
+
+    print(f"{'numbers':>8} {'chars':>8}  {'regex cascade':>15}  {'detector':>12}  {'speedup':>8}")
+    for size in args.sizes:
+        lines = [ability_description(size, rng) for _ in range(args.lines)]
+        expected, legacy_time = timed(legacy_verdicts, lines, args.repeat)
+        actual, detector_time = timed(detector_verdicts, lines, args.repeat)
+        status = "" if expected == actual else "  MISMATCH"
+        per_line = 1000 / len(lines)
+        print(f"{size:8d} {len(lines[0]):8d}  {legacy_time * per_line:12.3f} ms  {detector_time * per_line:9.3f} ms  "
+              f"{legacy_time / detector_time:7.1f}x{status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import wiki_html
+from benchmarks.synthetic_wiki import category_page, patch_history_page, season_dates_page, skins_page
+
+PAGES = [
+    # (page type, strainer the scraper uses, (tag, attrs) the scraper reads)
+    ('skins list', wiki_html.SKINS_TABLE, ('table', {'class': ['sortable', 'article-table', 'nopadding']})),
+    ('patch history', wiki_html.PARSER_OUTPUT, ('div', {'class': 'mw-parser-output'})),
+    ('season dates', wiki_html.SEASON_TABLES, ('table', {'class': ['sortable', 'article-table']})),
+    ('category', wiki_html.CATEGORY_GROUPS, ('div', {'class': 'mw-category-group'})),
+]
+
+
+def available_backends():
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    return backends
+
+
+def rss_bytes():
+    # Current resident set size; /proc is Linux only
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+def reset_peak_rss():
+    # Writing 5 to clear_refs resets the peak (VmHWM) on Linux; elsewhere the peak only grows
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def rss_child(path, page_type, backend, label):
+    # Runs in a fresh interpreter per measurement, so the RSS delta is this one parse and
+    # includes what the C parsers allocate outside tracemalloc's view
+    only = next(strainer for name, strainer, _ in PAGES if name == page_type) if label == 'scoped' else None
+    with open(path, 'rb') as f:
+        content = f.read()
+    # Loads the backend before measuring, so the delta is the parse and not the import
+    wiki_html.parse(b'<html><body><div></div></body></html>', only, backend).decompose()
+    gc.collect()
+    # Without a reset, only growth past the interpreter's startup peak is visible
+    before = rss_bytes() if reset_peak_rss() else peak_rss_bytes()
+    soup = wiki_html.parse(content, only, backend)
+    peak = peak_rss_bytes()
+    print(json.dumps({'peak': max(peak - before, 0)}))
+    soup.decompose()
+
+
+def measure_rss(content, page_type, backend, label):
+    if resource is None:
+        return None
+    with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as f:
+        f.write(content)
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_parsing', '--rss-child', f.name, page_type, backend, label],
+            capture_output=True, text=True, check=True)
+    finally:
+        os.remove(f.name)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(content, only, backend, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = wiki_html.parse(content, only, backend)
+        timings.append(time.perf_counter() - start)
+        soup.decompose()
+
+    gc.collect()
+    tracemalloc.start()
+    soup = wiki_html.parse(content, only, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return soup, min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whole-page vs table-scoped parsing per wiki page type")
+    parser.add_argument('--skins', type=int, default=1900, help="Rows in the synthetic skins table")
+    parser.add_argument('--patches', type=int, default=300, help="Entries in the synthetic patch pages")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--rss-child', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_child:
+        rss_child(*args.rss_child)
+        return
+
+    contents = {
+        'skins list': skins_page(args.skins),
+        'patch history': patch_history_page(args.patches),
+        'season dates': season_dates_page(args.patches),
+        'category': category_page(),
+    }
+
+    mib = 1024 * 1024
+    for page_type, strainer, (tag, attrs) in PAGES:
+        content = contents[page_type].encode('utf-8')
+        print(f"{page_type} ({len(content) / mib:.2f} MiB)")
+
+        baseline = None
+        for backend in available_backends():
+            for label, only in (('whole page', None), ('scoped', strainer)):
+                soup, elapsed, peak = measure(content, only, backend, args.repeat)
+                target = str(soup.find(tag, attrs))
+                soup.decompose()
+                rss = measure_rss(content, page_type, backend, label)
+                rss_peak = rss['peak'] if rss else None
+                if baseline is None:
+                    baseline = (elapsed, peak, target, rss_peak)
+                same = "same" if target == baseline[2] else "DIFFERENT"
+                line = (f"  {backend:<11} {label:<10} {elapsed * 1000:8.1f} ms ({baseline[0] / elapsed:4.1f}x)  "
+                        f"traced peak {peak / mib:6.1f} MiB ({baseline[1] / peak:4.1f}x)  ")
+                if rss_peak is not None:
+                    ratio = f"{baseline[3] / rss_peak:4.1f}x" if rss_peak and baseline[3] else "  - "
+                    line += f"RSS +{rss_peak / mib:6.1f} MiB ({ratio})  "
+                print(line + f"target {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import logging
+import time
+
+import requests
+
+import fetcher
+import patch_data
+from benchmarks.stub_server import StubWikiServer
+from benchmarks.synthetic_wiki import CHAMPIONS, patch_history_page
+
+
+def counters(server):
+    return server.hits, server.not_modified, server.connections, server.bytes_sent
+
+
+def report(label, elapsed, before, after):
+    hits, not_modified, connections, sent = (b - a for a, b in zip(before, after))
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {hits:4d} requests  {not_modified:4d} x 304  "
+          f"{connections:4d} connections  {sent / 1024 / 1024:7.2f} MiB body")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patch-history refresh cycle: plain GETs vs pooled conditional fetches")
+    parser.add_argument('--champions', type=int, default=len(CHAMPIONS))
+    parser.add_argument('--patches', type=int, default=120, help="Entries per synthetic patch history page")
+    parser.add_argument('--latency', type=float, default=0.01, help="Injected per-request latency in seconds")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    champions = CHAMPIONS[:args.champions]
+    paths = [f"/{champion.replace(' ', '_')}/Patch_history" for champion in champions]
+    pages = {path: patch_history_page(args.patches, seed=i) for i, path in enumerate(paths)}
+
+    with StubWikiServer(pages, latency=args.latency) as server:
+        urls = [server.url(path) for path in paths]
+
+        def legacy(url):
+            return patch_data.parse_patch_history(requests.get(url, timeout=10).content)
+
+        def pooled(url):
+            return fetcher.fetch_parsed(url, patch_data.parse_patch_history).value
+
+        before = counters(server)
+        start = time.perf_counter()
+        expected = fetcher.map_urls(legacy, urls)
+        report("requests.get + parse", time.perf_counter() - start, before, counters(server))
+
+        for label in ("pooled, cold", "pooled, revalidated"):
+            before = counters(server)
+            start = time.perf_counter()
+            actual = fetcher.map_urls(pooled, urls)
+            report(label, time.perf_counter() - start, before, counters(server))
+            if actual != expected:
+                print("  parsed results differ from the plain fetch")
+
+        if len(urls) > fetcher.VALIDATED_ENTRIES:
+            print(f"  {len(urls)} pages but FETCH_VALIDATED_ENTRIES={fetcher.VALIDATED_ENTRIES}; "
+                  f"a cycle larger than the validator cache never revalidates")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+
+import disk_cache
+import fetcher
+import patch_data
+import skin_data
+from benchmarks.harness import reset_caches
+from benchmarks.stub_server import StubWikiServer
+from benchmarks.synthetic_wiki import CHAMPIONS, wiki_pages
+
+WIKI_ORIGIN = "https://wiki.leagueoflegends.com"
+
+
+def stampede(jobs, callers):
+    # Every caller of every job is released at the same instant by one barrier
+    barrier = threading.Barrier(len(jobs) * callers)
+    errors = []
+
+    def run(job):
+        barrier.wait()
+        try:
+            job()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in jobs for _ in range(callers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent cache misses: one upstream request per key")
+    parser.add_argument('--champions', type=int, default=4)
+    parser.add_argument('--callers', type=int, default=16, help="Concurrent callers per key")
+    parser.add_argument('--patches', type=int, default=120)
+    parser.add_argument('--latency', type=float, default=0.05, help="Injected per-request latency in seconds")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    disk_cache.CACHE_DIR = tempfile.mkdtemp(prefix='lol-cache-')
+
+    champions = CHAMPIONS[:args.champions]
+    pages = wiki_pages(champions, args.patches)
+    cold = [
+        ("champions", patch_data.fetch_champions_list),
+        ("patch dates", patch_data.get_patch_dates),
+        ("skins", skin_data.get_all_skins_data),
+    ] + [(f"patches:{champion}", lambda champion=champion: patch_data.get_patch_data(champion))
+         for champion in champions]
+    uncoalesced = [
+        patch_data._fetch_champions_list,
+        skin_data._load_skins_data,
+    ] + [lambda champion=champion: patch_data._fetch_patch_history(champion) for champion in champions]
+
+    failed = False
+    with StubWikiServer(pages, latency=args.latency) as server:
+        server.mount(fetcher._session, WIKI_ORIGIN)
+
+        for label, jobs in (("without coalescing", uncoalesced), ("single-flight", [job for _, job in cold])):
+            reset_caches()
+            server.path_hits.clear()
+            elapsed, errors = stampede(jobs, args.callers)
+            worst = max(server.path_hits.values())
+            print(f"{label:<20} {elapsed * 1000:8.1f} ms  {sum(server.path_hits.values()):5d} upstream requests  "
+                  f"{len(server.path_hits):3d} pages  max {worst:3d} per page  {len(errors)} errors")
+
+        duplicated = {path: hits for path, hits in server.path_hits.items() if hits != 1}
+        if duplicated or errors:
+            failed = True
+            print(f"FAIL: duplicated upstream requests {duplicated}, errors {errors}")
+        else:
+            print(f"OK: {len(cold)} keys x {args.callers} callers, every page fetched exactly once")
+        print(f"flights: {patch_data.flights.stats()}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import logging
+import random
+import re
+import time
+from datetime import datetime
+
+import skin_data
+from benchmarks.synthetic_wiki import CHAMPIONS, skins_page
+from champion_registry import ChampionSnapshot
+
+
+def legacy_sort(champion_skins):
+    # The per-champion sort_key closure build_skins_data used before dates became ordinals
+    for champion in champion_skins:
+        try:
+            def sort_key(x):
+                date = x['release_date']
+
+                if champion in skin_data.CUSTOM_SKIN_MAPPINGS.values() and x['name'] in skin_data.CUSTOM_SKIN_MAPPINGS.keys():
+                    if date != "Unknown" and re.search(r'\d{1,2}-[A-Za-z]{3}-\d{4}', date):
+                        match = re.search(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})', date)
+                        if match:
+                            day, month, year = match.groups()
+                            month_map = {
+                                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+                                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+                            }
+                            return datetime(int(year), month_map.get(month, 1), int(day))
+                    return datetime(2023, 1, 1)
+
+                if date == "Unknown":
+                    return datetime.min
+
+                if re.search(r'\d{1,2}-[A-Za-z]{3}-\d{4}', date):
+                    match = re.search(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})', date)
+                    if match:
+                        day, month, year = match.groups()
+                        month_map = {
+                            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+                            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+                        }
+                        return datetime(int(year), month_map.get(month, 1), int(day))
+
+                year_match = re.search(r'\b(20\d\d|19\d\d)\b', date)
+                if year_match:
+                    try:
+                        year = int(year_match.group(1))
+
+                        month_match = re.search(r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b', date, re.IGNORECASE)
+                        month = 1
+                        if month_match:
+                            month_name = month_match.group(1).lower()
+                            months = {
+                                'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+                                'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+                                'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
+                                'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+                            }
+                            month = months.get(month_name, 1)
+
+                        day = 1
+                        day_match = re.search(r'\b(\d{1,2})(st|nd|rd|th)?\b', date)
+                        if day_match:
+                            day = int(day_match.group(1))
+
+                        return datetime(year, month, day)
+                    except (ValueError, OverflowError):
+                        return datetime.min
+
+                return datetime.min
+
+            champion_skins[champion].sort(key=sort_key, reverse=True)
+        except Exception as e:
+            logging.error(f"Error sorting skins for {champion}: {e}")
+
+
+def shuffled_copy(champion_skins, seed):
+    rng = random.Random(seed)
+    copy = {}
+    for champion, skins in champion_skins.items():
+        skins = [dict(skin) for skin in skins]
+        rng.shuffle(skins)
+        copy[champion] = skins
+    return copy
+
+
+def best_of(repeat, setup, func):
+    best = None
+    for _ in range(repeat):
+        data = setup()
+        start = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skin sort phase: per-call date parsing vs ingest-time ordinals")
+    parser.add_argument('--skins', type=int, default=2000, help="Rows in the synthetic skins table")
+    parser.add_argument('--custom', type=int, default=40, help="Skins given a custom champion mapping")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rows = skin_data.parse_skins_table(skins_page(args.skins).encode('utf-8'))
+    champion_skins = skin_data.build_skins_data(rows, ChampionSnapshot(CHAMPIONS))
+
+    # Custom mappings take a different key path, so exercise it too
+    rng = random.Random(1)
+    added = {}
+    for champion in rng.sample(sorted(champion_skins), min(args.custom, len(champion_skins))):
+        skin = rng.choice(champion_skins[champion])
+        if skin['name'] not in skin_data.CUSTOM_SKIN_MAPPINGS:
+            added[skin['name']] = champion
+    skin_data.CUSTOM_SKIN_MAPPINGS.update(added)
+    custom_mappings = dict(skin_data.CUSTOM_SKIN_MAPPINGS)
+
+    try:
+        expected = shuffled_copy(champion_skins, seed=2)
+        legacy_sort(expected)
+        actual = shuffled_copy(champion_skins, seed=2)
+        skin_data.sort_champion_skins(actual, custom_mappings)
+        mismatches = sum(
+            [skin['name'] for skin in expected[champion]] != [skin['name'] for skin in actual[champion]]
+            for champion in expected
+        )
+
+        def ingest_and_sort(data):
+            # Cold memo tables: normalize every date into its ordinal, then sort
+            skin_data._date_ordinal.cache_clear()
+            for skins in data.values():
+                for skin in skins:
+                    skin['release_ordinal'] = skin_data.release_ordinal(skin['release_date'])
+            skin_data.sort_champion_skins(data, custom_mappings)
+
+        setup = lambda: shuffled_copy(champion_skins, seed=3)
+        legacy_time = best_of(args.repeat, setup, legacy_sort)
+        cold_time = best_of(args.repeat, setup, ingest_and_sort)
+        warm_time = best_of(args.repeat, setup, lambda data: skin_data.sort_champion_skins(data, custom_mappings))
+    finally:
+        for name in added:
+            del skin_data.CUSTOM_SKIN_MAPPINGS[name]
+
+    total = sum(len(skins) for skins in champion_skins.values())
+    print(f"{total} skins across {len(champion_skins)} champions, {len(added)} custom-mapped")
+    print(f"legacy sort_key closures     {legacy_time * 1000:8.2f} ms")
+    print(f"ordinals, ingest + sort      {cold_time * 1000:8.2f} ms  ({legacy_time / cold_time:5.1f}x)")
+    print(f"ordinals, sort only          {warm_time * 1000:8.2f} ms  ({legacy_time / warm_time:5.1f}x)")
+    print(f"champions ordered differently {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
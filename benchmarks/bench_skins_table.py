@@ -0,0 +1,79 @@
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import skin_data
+from benchmarks.synthetic_wiki import CHAMPIONS, skins_page
+from champion_registry import ChampionSnapshot
+
+
+def legacy_three_walks(content):
+    # Cell access pattern of the old get_all_skins_data: the soup stays alive and
+    # every stage re-runs find_all/get_text over the same rows
+    soup = BeautifulSoup(content, 'html.parser')
+    table = soup.find('table', {'class': ['sortable', 'article-table', 'nopadding']})
+    rows = table.find_all('tr')
+    name_idx, release_idx = 1, 2
+    seen = 0
+    for _ in range(3):
+        for row in rows[1:]:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) <= max(name_idx, release_idx):
+                continue
+            cells[name_idx].get_text(strip=True)
+            cells[release_idx].get_text(strip=True)
+            cells[release_idx].find_all('a')
+            cells[0].get_text(strip=True)
+            seen += 1
+    return soup, seen
+
+
+def measure(func, *args):
+    # Timed without tracemalloc, then re-run for memory; the soup is full of
+    # reference cycles, so collect before reading what the result retains
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row walks over List_of_champion_skins: legacy vs SkinRow model")
+    parser.add_argument('--html', help="Saved copy of List_of_champion_skins (defaults to a synthetic page)")
+    parser.add_argument('--rows', type=int, default=1900, help="Rows in the synthetic page")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.html:
+        with open(args.html, 'rb') as f:
+            content = f.read()
+    else:
+        content = skins_page(args.rows).encode('utf-8')
+
+    registry = ChampionSnapshot(CHAMPIONS, version=1)
+
+    (_, walked), legacy_time, legacy_retained, legacy_peak = measure(legacy_three_walks, content)
+    skin_rows, parse_time, rows_retained, parse_peak = measure(skin_data.parse_skins_table, content)
+    _, build_time, _, build_peak = measure(skin_data.build_skins_data, skin_rows, registry)
+
+    mib = 1024 * 1024
+    print(f"{len(content) / mib:.2f} MiB page, {len(skin_rows)} rows")
+    print(f"legacy parse + 3 walks   {legacy_time * 1000:8.1f} ms  peak {legacy_peak / mib:7.1f} MiB  retained {legacy_retained / mib:7.1f} MiB")
+    print(f"parse_skins_table        {parse_time * 1000:8.1f} ms  peak {parse_peak / mib:7.1f} MiB  retained {rows_retained / mib:7.1f} MiB")
+    print(f"build_skins_data         {build_time * 1000:8.1f} ms  peak {build_peak / mib:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+import os
+import tempfile
+
+# Runs against its own cache directory and mapping journal, with no background refresh
+os.environ['LOL_CACHE_DIR'] = tempfile.mkdtemp(prefix='lol-bench-')
+os.environ['BACKGROUND_REFRESH'] = '0'
+
+import argparse
+import functools
+import gc
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import disk_cache
+import fetcher
+import patch_data
+import skin_data
+import wiki_transport
+from benchmarks.harness import reset_caches, response_error
+from benchmarks.synthetic_wiki import CHAMPIONS, wiki_pages, write_fixtures
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Champions standing in for a short, a medium and a very long patch history
+HISTORY_CHAMPIONS = ('Mel', 'Ahri', 'Alistar')
+SYNTHETIC_HISTORIES = {'Mel': 8, 'Ahri': 120, 'Alistar': 330}
+
+# A metric regresses when it exceeds the baseline by the relative tolerance *and* by this floor;
+# upstream request counts are exact and any increase fails
+NOISE_FLOOR = {'cold_ms': 2.0, 'warm_ms': 0.5, 'peak_kib': 256, 'retained_kib': 256, 'allocated_blocks': 2000,
+               'upstream_requests': 0}
+
+
+def route(client, method, path, **kwargs):
+    response = client.open(path, method=method, **kwargs)
+    error = response_error(response.status_code, response.content_type, response.data)
+    if error:
+        raise RuntimeError(f"{method} {path} failed: {error}")
+    return response
+
+
+def build_cases(client, short, medium, long):
+    def dates_ready():
+        patch_data.get_champions_list()
+        patch_data.get_patch_dates()
+
+    def skins_ready():
+        patch_data.get_champions_list()
+        skin_data.get_all_skins_data()
+
+    def match_other_skins():
+        for skin in skin_data.get_all_skins_data().get('Other', []):
+            skin_data.find_potential_champion_matches(skin['name'])
+
+    # (name, setup run before each cold measurement, measured call)
+    cases = [
+        ('get_champions_list', None, patch_data.get_champions_list),
+        ('get_patch_dates', None, patch_data.get_patch_dates),
+    ]
+    for label, champion in (('short', short), ('medium', medium), ('long', long)):
+        cases.append((f'get_patch_data[{label}]', dates_ready, functools.partial(
+            patch_data.get_patch_data, champion, include_undocumented=True,
+            exclude_art_sustainability=True, exclude_alpha_v1=True)))
+    cases += [
+        ('get_all_skins_data', patch_data.get_champions_list, skin_data.get_all_skins_data),
+        ('find_potential_champion_matches[Other]', skins_ready, match_other_skins),
+    ]
+
+    routes = [
+        ('GET', '/', {}),
+        ('GET', f'/patches?champion={medium}', {}),
+        ('GET', '/skins', {}),
+        ('GET', '/analytics', {}),
+        ('GET', f'/debug?champion={medium}', {}),
+        ('GET', '/debug/skins', {}),
+        ('GET', '/debug/cache', {}),
+        ('GET', '/debug/refresh', {}),
+        ('POST', '/assign_skin_champion', {'json': {'skin_name': 'Benchmark Skin', 'champion_name': medium}}),
+    ]
+    for method, path, kwargs in routes:
+        name = f"{method} {path.split('?')[0]}"
+        cases.append((name, None, functools.partial(route, client, method, path, **kwargs)))
+    return cases
+
+
+def measure(setup, func, repeat):
+    cold = []
+    requests = None
+    for _ in range(repeat):
+        reset_caches()
+        if setup:
+            setup()
+        gc.collect()
+        before = wiki_transport.stats.snapshot()['requests']
+        start = time.perf_counter()
+        func()
+        cold.append(time.perf_counter() - start)
+        requests = wiki_transport.stats.snapshot()['requests'] - before
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        warm.append(time.perf_counter() - start)
+
+    # Memory in a separate cold run, since tracing distorts the timings. The collector is paused so
+    # the block delta counts what the call allocated and did not free, cyclic garbage included.
+    reset_caches()
+    if setup:
+        setup()
+    gc.collect()
+    gc.disable()
+    try:
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        try:
+            func()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        blocks = sys.getallocatedblocks() - blocks
+    finally:
+        gc.enable()
+
+    return {
+        'cold_ms': round(statistics.median(cold) * 1000, 3),
+        'warm_ms': round(statistics.median(warm) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_kib': round(current / 1024, 1),
+        'allocated_blocks': blocks,
+        'upstream_requests': requests,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for case, metrics in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            limit = old + floor if metric == 'upstream_requests' else max(old * (1 + tolerance), old + floor)
+            if new > limit:
+                regressions.append((case, metric, old, new))
+    return regressions
+
+
+def environment(fixtures):
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'fixtures': fixtures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers and routes against replayed wiki fixtures")
+    parser.add_argument('--fixtures', help="Recorded fixture directory (default: a generated synthetic wiki)")
+    parser.add_argument('--histories', nargs=3, metavar=('SHORT', 'MEDIUM', 'LONG'), default=HISTORY_CHAMPIONS,
+                        help="Champions with a short, medium and very long patch history")
+    parser.add_argument('--latency', type=float, default=0.0, help="Injected seconds per upstream response")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', nargs='*', help="Run only cases whose name contains one of these")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.5, help="Allowed relative slowdown or growth")
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    fixtures = args.fixtures
+    if fixtures is None:
+        fixtures = os.path.join(disk_cache.CACHE_DIR, 'synthetic_fixtures')
+        write_fixtures(fixtures, wiki_pages(CHAMPIONS, histories=SYNTHETIC_HISTORIES, unattributed=1.0))
+    fetcher.set_adapter(wiki_transport.ReplayAdapter(wiki_transport.FixtureStore(fixtures), latency=args.latency, jitter=0))
+
+    import main as app_main
+    client = app_main.app.test_client()
+
+    results = {}
+    print(f"{'case':<42} {'cold':>10} {'warm':>10} {'peak':>10} {'retained':>10} {'blocks':>8} {'upstream':>8}")
+    for name, setup, func in build_cases(client, *args.histories):
+        if args.only and not any(part in name for part in args.only):
+            continue
+        metrics = measure(setup, func, args.repeat)
+        results[name] = metrics
+        print(f"{name:<42} {metrics['cold_ms']:7.2f} ms {metrics['warm_ms']:7.3f} ms {metrics['peak_kib']:6.0f} KiB "
+              f"{metrics['retained_kib']:6.0f} KiB {metrics['allocated_blocks']:8d} {metrics['upstream_requests']:8d}")
+
+    env = environment(args.fixtures or 'synthetic')
+    report = {'environment': env, 'repeat': args.repeat, 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+        print(f"Updated baseline {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    if baseline.get('environment') != env:
+        print(f"Warning: baseline was recorded on {baseline.get('environment')}, this run is {env}")
+
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+    for case, metric, old, new in regressions:
+        print(f"REGRESSION {case} {metric}: {old} -> {new}")
+    if regressions:
+        sys.exit(1)
+    print(f"OK: no regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import html
+import json
+import os
+import re
+
+import disk_cache
+import fetcher
+import patch_data
+import patch_version
+import skin_data
+
+# Routes report most failures with a 200: an error.html page or a JSON body with an "error" key
+ERROR_PAGE_TITLE = b'<title>Error - '
+ERROR_MESSAGE_RE = re.compile(rb'<p class="lead mb-4">(.*?)</p>', re.S)
+
+
+def response_error(status, content_type, body):
+    # None for a successful response, otherwise a short description of the failure
+    if status != 200:
+        return f"HTTP {status}"
+
+    if content_type and content_type.startswith('application/json'):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return "invalid JSON body"
+        if isinstance(data, dict) and ('error' in data or data.get('success') is False):
+            return str(data.get('error') or "success: false")
+        return None
+
+    if ERROR_PAGE_TITLE in body:
+        match = ERROR_MESSAGE_RE.search(body)
+        message = html.unescape(match.group(1).decode('utf-8', 'replace').strip()) if match else ""
+        return f"error page: {message}" if message else "error page"
+    return None
+
+
+def reset_caches():
+    # Every cache the app keeps, in memory and on disk, so "cold" means a fresh process
+    patch_data.reset_caches()
+    skin_data.reset_caches()
+    fetcher.reset_validators()
+    patch_version.patch_version.cache_clear()
+    try:
+        os.remove(disk_cache.cache_path(patch_data.PATCH_DATES_CACHE_FILE))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,251 @@
+import os
+import tempfile
+
+# An in-process app gets its own cache directory and no background refresh, so every run starts cold
+os.environ['LOL_CACHE_DIR'] = tempfile.mkdtemp(prefix='lol-load-')
+os.environ['BACKGROUND_REFRESH'] = '0'
+
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+import wiki_transport
+from benchmarks.harness import response_error
+from benchmarks.synthetic_wiki import CHAMPIONS, wiki_pages
+
+WIKI_ORIGIN = "https://wiki.leagueoflegends.com"
+
+ROUTES = {
+    'patches': '/patches?champion={champion}',
+    'skins': '/skins',
+    'analytics': '/analytics',
+    'debug': '/debug?champion={champion}',
+}
+DEFAULT_MIX = ['patches=4', 'skins=2', 'analytics=1', 'debug=1']
+DEFAULT_CHAMPIONS = ['Alistar', 'Ahri', 'Mel', 'Jinx', 'Lee Sin', "Kai'Sa"]
+
+
+def parse_mix(items):
+    mix = {}
+    for item in items:
+        route, _, weight = item.partition('=')
+        if route not in ROUTES:
+            raise SystemExit(f"Unknown route {route!r}; expected one of {', '.join(ROUTES)}")
+        mix[route] = float(weight or 1)
+    return mix
+
+
+def request_plan(mix, champions, count, seed):
+    rng = random.Random(seed)
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    return [(route, ROUTES[route].format(champion=rng.choice(champions)))
+            for route in rng.choices(routes, weights, k=count)]
+
+
+def percentile(sorted_values, fraction):
+    # Nearest rank
+    if not sorted_values:
+        return None
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class InProcessClient:
+    # One Flask test client per worker thread, so requests run concurrently through the real app
+    def __init__(self, app):
+        self._app = app
+        self._local = threading.local()
+
+    def get(self, path):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._app.test_client()
+        response = client.get(path)
+        return response.status_code, response.content_type, response.data
+
+
+class HttpClient:
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self, path):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.get(self.base_url + path, timeout=self.timeout)
+        return response.status_code, response.headers.get('Content-Type'), response.content
+
+
+def run_load(client, plan, concurrency):
+    samples = []
+    lock = threading.Lock()
+    position = iter(range(len(plan)))
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker():
+        barrier.wait()
+        while True:
+            with lock:
+                index = next(position, None)
+            if index is None:
+                return
+            route, path = plan[index]
+            start = time.perf_counter()
+            try:
+                status, content_type, body = client.get(path)
+                size = len(body)
+                error = response_error(status, content_type, body)
+            except Exception as e:
+                size, error = 0, str(e)
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples.append((route, elapsed, size, error))
+
+    threads = [threading.Thread(target=worker, name=f'load-{i}', daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # Every worker is released at once, so a cold start is a real stampede
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, wall):
+    by_route = defaultdict(list)
+    for route, elapsed, size, error in samples:
+        by_route[route].append((elapsed, size, error))
+        by_route['all'].append((elapsed, size, error))
+
+    summary = {}
+    for route, rows in by_route.items():
+        latencies = sorted(elapsed for elapsed, _, _ in rows)
+        errors = [error for _, _, error in rows if error]
+        summary[route] = {
+            'requests': len(rows),
+            'errors': len(errors),
+            'throughput_rps': round(len(rows) / wall, 1) if wall else None,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'bytes': sum(size for _, size, _ in rows),
+            'first_error': errors[0] if errors else None,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test /patches, /skins, /analytics and /debug against the offline wiki stand-in",
+        epilog="To load a separately running server, start it with WIKI_TRANSPORT=standin and "
+               "WIKI_STANDIN_URL=http://127.0.0.1:<standin-port>, then pass --target http://host:port.")
+    parser.add_argument('--target', default='app', help="'app' for the in-process Flask app, or a server URL")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400, help="Measured requests")
+    parser.add_argument('--warmup', type=int, default=0,
+                        help="Requests sent before measuring (0 measures the cold-start stampede)")
+    parser.add_argument('--mix', nargs='+', default=DEFAULT_MIX, metavar='ROUTE=WEIGHT')
+    parser.add_argument('--champions', nargs='+', default=DEFAULT_CHAMPIONS)
+    parser.add_argument('--fixtures', help="Recorded fixture directory (default: a generated synthetic wiki)")
+    parser.add_argument('--latency', type=float, default=0.05, help="Stand-in latency per wiki response, seconds")
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--standin-port', type=int, default=0, help="Fixed stand-in port for --target URL runs")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the report as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    mix = parse_mix(args.mix)
+
+    if args.fixtures:
+        store = wiki_transport.FixtureStore(args.fixtures)
+    else:
+        store = wiki_transport.PageStore(wiki_pages(CHAMPIONS, histories={'Mel': 8, 'Ahri': 120, 'Alistar': 330}))
+
+    with wiki_transport.StandInServer(store, port=args.standin_port, latency=args.latency, jitter=args.jitter) as standin:
+        if args.target == 'app':
+            import fetcher
+            import main as app_main
+
+            standin.mount(fetcher._session, WIKI_ORIGIN)
+            client = InProcessClient(app_main.app)
+        else:
+            client = HttpClient(args.target, args.timeout)
+        print(f"Wiki stand-in at {standin.base_url}, {args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms per response")
+
+        if args.warmup:
+            run_load(client, request_plan(mix, args.champions, args.warmup, args.seed + 1), args.concurrency)
+        hits_before = standin.hits
+        pages_before = dict(standin.path_hits)
+        not_modified_before = standin.not_modified
+
+        plan = request_plan(mix, args.champions, args.requests, args.seed)
+        samples, wall = run_load(client, plan, args.concurrency)
+
+        upstream = standin.hits - hits_before
+        page_hits = {path: hits - pages_before.get(path, 0) for path, hits in standin.path_hits.items()
+                     if hits > pages_before.get(path, 0)}
+        not_modified = standin.not_modified - not_modified_before
+
+    summary = summarize(samples, wall)
+    duplicated = {path: hits for path, hits in page_hits.items() if hits > 1}
+
+    phase = "warm" if args.warmup else "cold start"
+    print(f"{len(samples)} requests ({phase}), concurrency {args.concurrency}, {wall:.2f} s")
+    print(f"{'route':<10} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for route in list(mix) + ['all']:
+        stats = summary.get(route)
+        if stats is None:
+            continue
+        print(f"{route:<10} {stats['requests']:8d} {stats['errors']:6d} {stats['throughput_rps']:8.1f} "
+              f"{stats['p50_ms']:6.1f} ms {stats['p95_ms']:6.1f} ms {stats['p99_ms']:6.1f} ms {stats['max_ms']:6.1f} ms")
+        if stats['first_error']:
+            print(f"           first error: {stats['first_error']}")
+
+    print(f"upstream: {upstream} wiki requests ({not_modified} x 304) for {len(samples)} requests, "
+          f"{upstream / max(len(samples), 1):.3f} per request, {len(page_hits)} distinct pages")
+    if duplicated:
+        print(f"FAIL: pages fetched more than once under load: {duplicated}")
+    else:
+        print("OK: every wiki page was fetched at most once; caches and coalescing held")
+
+    if args.output:
+        report = {
+            'target': args.target,
+            'phase': phase,
+            'concurrency': args.concurrency,
+            'mix': mix,
+            'wall_s': round(wall, 3),
+            'routes': summary,
+            'upstream': {
+                'requests': upstream,
+                'not_modified': not_modified,
+                'per_request': round(upstream / max(len(samples), 1), 4),
+                'pages': page_hits,
+                'duplicated': duplicated,
+            },
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {args.output}")
+
+    errors = summary.get('all', {}).get('errors', 0)
+    sys.exit(1 if duplicated or errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+from wiki_transport import PageStore, StandInServer
+
+
+class StubWikiServer(StandInServer):
+    # The wiki stand-in serving generated pages ({path: html}) instead of recorded fixtures
+    def __init__(self, pages, latency=0.0):
+        super().__init__(PageStore(pages), latency=latency)
+
+    @property
+    def pages(self):
+        return self.store.pages
@@ -0,0 +1,214 @@
+import argparse
+import random
+from urllib.parse import urlsplit
+
+CHAMPIONS = [
+    "Aatrox", "Ahri", "Akali", "Akshan", "Alistar", "Ambessa", "Amumu", "Anivia", "Annie", "Aphelios",
+    "Ashe", "Aurelion Sol", "Aurora", "Azir", "Bard", "Bel'Veth", "Blitzcrank", "Brand", "Braum", "Briar",
+    "Caitlyn", "Camille", "Cassiopeia", "Cho'Gath", "Corki", "Darius", "Diana", "Dr. Mundo", "Draven",
+    "Ekko", "Elise", "Evelynn", "Ezreal", "Fiddlesticks", "Fiora", "Fizz", "Galio", "Gangplank", "Garen",
+    "Gnar", "Gragas", "Graves", "Gwen", "Hecarim", "Heimerdinger", "Hwei", "Illaoi", "Irelia", "Ivern",
+    "Janna", "Jarvan IV", "Jax", "Jayce", "Jhin", "Jinx", "K'Sante", "Kai'Sa", "Kalista", "Karma",
+    "Karthus", "Kassadin", "Katarina", "Kayle", "Kayn", "Kennen", "Kha'Zix", "Kindred", "Kled", "Kog'Maw",
+    "LeBlanc", "Lee Sin", "Leona", "Lillia", "Lissandra", "Lucian", "Lulu", "Lux", "Malphite", "Malzahar",
+    "Maokai", "Master Yi", "Mel", "Milio", "Miss Fortune", "Mordekaiser", "Morgana", "Naafiri", "Nami",
+    "Nasus", "Nautilus", "Neeko", "Nidalee", "Nilah", "Nocturne", "Nunu & Willump", "Olaf", "Orianna",
+    "Ornn", "Pantheon", "Poppy", "Pyke", "Qiyana", "Quinn", "Rakan", "Rammus", "Rek'Sai", "Rell",
+    "Renata Glasc", "Renekton", "Rengar", "Riven", "Rumble", "Ryze", "Samira", "Sejuani", "Senna",
+    "Seraphine", "Sett", "Shaco", "Shen", "Shyvana", "Singed", "Sion", "Sivir", "Skarner", "Smolder",
+    "Sona", "Soraka", "Swain", "Sylas", "Syndra", "Tahm Kench", "Taliyah", "Talon", "Taric", "Teemo",
+    "Thresh", "Tristana", "Trundle", "Tryndamere", "Twisted Fate", "Twitch", "Udyr", "Urgot", "Varus",
+    "Vayne", "Veigar", "Vel'Koz", "Vex", "Vi", "Viego", "Viktor", "Vladimir", "Volibear", "Warwick",
+    "Wukong", "Xayah", "Xerath", "Xin Zhao", "Yasuo", "Yone", "Yorick", "Yunara", "Yuumi", "Zac", "Zed",
+    "Zeri", "Ziggs", "Zilean", "Zoe", "Zyra",
+]
+
+SKIN_LINES = [
+    "Hextech", "Project:", "Arcade", "Pool Party", "Battle Academia", "Cosmic", "Dark Star", "Blood Moon",
+    "Spirit Blossom", "Elderwood", "Snowdown", "Lunar Wraith", "Championship", "Victorious", "Conqueror",
+    "Star Guardian", "High Noon", "PROJECT:", "Coven", "Odyssey", "Mecha", "Infernal", "Bewitching",
+    "Winterblessed", "Empyrean", "Sentinel", "Prestige", "Debonair", "Crime City", "Mythmaker",
+]
+
+OTHER_SKINS = [
+    "Beezcrank", "King Beegar", "Bee'Koz", "Kittalee", "Bewitching Batnivia", "Zap'Maw", "Heimerstinger",
+    "Orbeeanna", "Admiral Glasc", "Space Groove Blitz & Crank", "Bee'Maw", "Beezahar", "Yuubee",
+    "The Thousand-Pierced Bear", "Meowrick", "Birdio", "Renektoy", "Meowkai", "Snowmerdinger",
+    "Nutcracko", "Brolaf", "Lollipoppy", "Giant Enemy Crabgot", "Mr. Mundoverse", "Pug'Maw",
+    "Urfwick", "Definitely Not Udyr", "Emumu", "Surprise Party Fiddlesticks", "Little Demon Tristana",
+    "Gun Goddess Miss Fortune", "Captain Fortune", "Dragon Trainer Tristana", "Sugar Rush Gragas",
+    "Mafia Jinx", "Battle Boss Ziggs", "Ocean Song Seraphine", "Pajama Guardian Cosplay Lux",
+    "Snow Day Gnar", "Astronaut Teemo", "Pulsefire Ezreal", "Mundo Mundo", "MF Prime", "TF Deluxe",
+    "J4 Mech", "Cass Classic", "Ali Chrome", "Kog the Toy", "Anna Banana",
+]
+
+CHANGE_LINES = [
+    "{ability}: Base damage increased to {a}/{b}/{c}/{d}/{e} from {b}/{c}/{d}/{e}/{f}.",
+    "{ability}: Cooldown reduced to {a} seconds from {b}.",
+    "{ability}: Mana cost changed to {a} \u21d2 {b}.",
+    "Stats: Base health increased to {a}0 from {b}0. Base armor {a} \u21d2 {b}.",
+    "General: Attack speed ratio {a}.{b}% \u21d2 {c}.{d}%. Movement speed {a}{b}5.",
+    "Fixed a bug where {ability} would not apply its bonus damage against champions.",
+    "{ability} no longer incorrectly cancels recall animations.",
+    "Tooltip updated to more accurately describe the ability.",
+    "Ability description text updated for clarity.",
+    "Updated ability icon for {ability} in the HUD.",
+    "Recommended items updated.",
+    "New splash artwork.",
+    "Updated splash art and loading screen portrait.",
+    "Visual effect and particle update for {ability}.",
+    "New animation for {ability}.",
+    "Model and texture update.",
+    "ARAM: Damage dealt increased to 10{a}%.",
+    "Undocumented: {ability} range changed to {a}{b}0 from {c}{d}0.",
+    "New Effect: Gains {a}0% bonus movement speed for {b} seconds.",
+    "{ability}: Now triggers on-hit effects.",
+    "{ability} (Passive): {a}{b}% bonus attack damage.",
+]
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def random_date(rng):
+    return f"{rng.randint(1, 28):02d}-{rng.choice(MONTHS)}-{rng.randint(2009, 2025)}"
+
+
+def skin_names(count, seed=0, champions=CHAMPIONS):
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.15:
+            names.append(rng.choice(OTHER_SKINS))
+        elif roll < 0.9:
+            names.append(f"{rng.choice(SKIN_LINES)} {rng.choice(champions)}")
+        else:
+            names.append(f"{rng.choice(SKIN_LINES)} {rng.choice(SKIN_LINES)} Edition {i}")
+    return names
+
+
+def skins_page(count, seed=0, champions=CHAMPIONS, unattributed=0.0):
+    # unattributed: share of the oddly named skins whose champion cell is left empty, as on the
+    # wiki, so attribution has to fall back to the name or leave them under "Other"
+    rng = random.Random(seed)
+    rows = [
+        '<table class="sortable article-table nopadding"><tr>'
+        '<th>Champion</th><th>Skin</th>'
+        '<th><img src="/images/Release.png" alt="Release"></th>'
+        '<th><img src="/images/Availability.png" alt="Availability"></th></tr>'
+    ]
+    for name in skin_names(count, seed=seed, champions=champions):
+        champion = next((c for c in champions if c in name), rng.choice(champions))
+        champion_cell = f'<a href="/en-us/{champion}">{champion}</a>'
+        if unattributed and name in OTHER_SKINS and rng.random() < unattributed:
+            champion_cell = ''
+        roll = rng.random()
+        if roll < 0.8:
+            release = f'<a href="/en-us/V{rng.randint(1, 14)}.{rng.randint(1, 24)}">{random_date(rng)}</a>'
+        elif roll < 0.9:
+            release = f'{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2009, 2025)}'
+        elif roll < 0.95:
+            release = f'<span data-sort-value="{rng.randint(2009, 2025)}-01-01">✔</span>'
+        else:
+            release = 'Unknown'
+        rows.append(
+            f'<tr><td>{champion_cell}</td>'
+            f'<td><a href="/en-us/{name}">{name}</a></td>'
+            f'<td>{release}</td><td>✔</td></tr>'
+        )
+    rows.append('</table>')
+    return wiki_page(
+        "List of champion skins",
+        '<div class="mw-parser-output"><p>' + 'Intro text. ' * 400 + '</p>' + ''.join(rows) + '</div>'
+    )
+
+
+def wiki_page(title, content):
+    # Site chrome around the article, roughly as heavy as the real wiki's navigation
+    nav = ''.join(f'<li><a href="/en-us/{c}">{c}</a></li>' for c in CHAMPIONS)
+    footer = ''.join(f'<li><a href="/en-us/Help:{i}">Help page {i}</a></li>' for i in range(200))
+    return (
+        f'<html><head><title>{title}</title>'
+        '<script>' + 'var config = {"key": "value"};' * 500 + '</script></head><body>'
+        f'<nav class="global-navigation"><ul>{nav}</ul></nav>'
+        f'<aside class="page-side-tools"><ul>{nav}</ul></aside>'
+        f'<main class="page__main"><h1>{title}</h1>{content}</main>'
+        f'<footer class="global-footer"><ul>{footer}</ul></footer></body></html>'
+    )
+
+
+def change_line(rng):
+    digits = {key: rng.randint(1, 9) for key in "abcdef"}
+    return rng.choice(CHANGE_LINES).format(ability=rng.choice(["Q", "W", "E", "R", "Passive"]), **digits)
+
+
+def patch_history_page(patches, seed=0):
+    rng = random.Random(seed)
+    sections = []
+    for i in range(patches):
+        version = f"V{14 - i // 24}.{24 - i % 24}"
+        changes = ''.join(f'<li>{change_line(rng)}</li>' for _ in range(rng.randint(1, 6)))
+        sections.append(f'<dl><dt><a href="/en-us/{version}">{version}</a></dt></dl><ul>{changes}</ul>')
+    return wiki_page("Patch history", '<div class="mw-parser-output">' + ''.join(sections) + '</div>')
+
+
+def season_dates_page(patches, seed=0):
+    rng = random.Random(seed)
+    rows = ''.join(
+        f'<tr><td>V{14 - i // 24}.{24 - i % 24}</td><td>{random_date(rng)}</td><td>Notes</td></tr>'
+        for i in range(patches)
+    )
+    return wiki_page(
+        "Patch",
+        '<div class="mw-parser-output"><table class="sortable article-table">'
+        f'<tr><th>Version</th><th>Date</th><th>Notes</th></tr>{rows}</table></div>'
+    )
+
+
+def category_page(champions=CHAMPIONS):
+    links = ''.join(f'<li><a href="/en-us/{c}/Patch_history">{c}/Patch history</a></li>' for c in champions)
+    return wiki_page(
+        "Category:LoL patch history",
+        f'<div class="mw-category"><div class="mw-category-group"><h3>A-Z</h3><ul>{links}</ul></div></div>'
+    )
+
+
+def wiki_pages(champions=CHAMPIONS, patches=48, skins=2000, histories=None, unattributed=0.0):
+    # {path: html} for every page the app fetches; histories overrides the patch count per champion
+    import patch_data
+
+    pages = {
+        "/en-us/Category:LoL_patch_history": category_page(),
+        "/en-us/List_of_champion_skins": skins_page(skins, unattributed=unattributed),
+    }
+    for i, url in enumerate(patch_data.SEASON_URLS):
+        pages[urlsplit(url).path] = season_dates_page(24, seed=i)
+    for i, champion in enumerate(champions):
+        count = (histories or {}).get(champion, patches)
+        pages[f"/en-us/{champion}/Patch_history"] = patch_history_page(count, seed=i)
+    return pages
+
+
+def write_fixtures(directory, pages, origin="https://wiki.leagueoflegends.com"):
+    from wiki_transport import FixtureStore
+
+    store = FixtureStore(directory)
+    for path, html in pages.items():
+        store.put(origin + path, 200, {'Content-Type': 'text/html; charset=utf-8'}, html.encode('utf-8'))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic wiki as replayable fixtures, for runs without a network")
+    parser.add_argument('directory')
+    parser.add_argument('--patches', type=int, default=48, help="Patches in each champion's history")
+    parser.add_argument('--skins', type=int, default=2000)
+    args = parser.parse_args()
+
+    pages = wiki_pages(CHAMPIONS, args.patches, args.skins)
+    write_fixtures(args.directory, pages)
+    print(f"Wrote {len(pages)} pages to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+from aho_corasick import AhoCorasick
+
+NAME = 0
+WORD = 1
+NICKNAME = 2
+SQUASHED_PREFIX = 3
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+def _is_bounded(text, start, end):
+    # Same test as re's \b on both ends of text[start:end]
+    before = start > 0 and _is_word_char(text[start - 1])
+    after = end < len(text) and _is_word_char(text[end])
+    return before != _is_word_char(text[start]) and after != _is_word_char(text[end - 1])
+
+
+class ChampionMatcher:
+    def __init__(self, snapshot, nickname_map, common_prefixes):
+        self.version = snapshot.version
+        self.names = snapshot.names
+        self.common_prefixes = tuple(common_prefixes)
+
+        clean_automaton = AhoCorasick()
+        squashed_automaton = AhoCorasick()
+        raw_automaton = AhoCorasick()
+
+        for idx, champion_lower in enumerate(snapshot.lower):
+            clean_automaton.add(champion_lower, (NAME, idx))
+            for word_idx, word in enumerate(champion_lower.split()):
+                if len(word) > 2:
+                    clean_automaton.add(word, (WORD, idx, word_idx))
+
+            squashed_automaton.add(champion_lower.replace("'", "").replace(" ", ""), idx)
+
+            raw_automaton.add(champion_lower.replace(' ', ''), (SQUASHED_PREFIX, idx))
+            raw_automaton.add(champion_lower[:4], (SQUASHED_PREFIX, idx))
+
+        index_by_lower = {champion_lower: idx for idx, champion_lower in enumerate(snapshot.lower)}
+        for nickname_idx, (nickname, champ) in enumerate(nickname_map.items()):
+            if champ in index_by_lower:
+                raw_automaton.add(nickname, (NICKNAME, index_by_lower[champ], nickname_idx))
+
+        self._clean = clean_automaton.build()
+        self._squashed = squashed_automaton.build()
+        self._raw = raw_automaton.build()
+
+    def clean_name(self, skin_lower):
+        for prefix in self.common_prefixes:
+            if skin_lower.startswith(prefix):
+                return skin_lower[len(prefix):]
+        return skin_lower
+
+    def score(self, skin_name):
+        skin_lower = skin_name.lower()
+        clean_skin_name = self.clean_name(skin_lower)
+
+        scores = {}
+        name_hits = {}
+        word_hits = set()
+
+        for start, end, value in self._clean.iter(clean_skin_name):
+            if value[0] == NAME:
+                idx = value[1]
+                if name_hits.get(idx) != 10:
+                    name_hits[idx] = 10 if _is_bounded(clean_skin_name, start, end) else 5
+            elif value not in word_hits:
+                word_hits.add(value)
+                scores[value[1]] = scores.get(value[1], 0) + 3
+
+        for idx, points in name_hits.items():
+            scores[idx] = scores.get(idx, 0) + points
+
+        for idx in set(self._squashed.values(clean_skin_name.replace(" ", ""))):
+            scores[idx] = scores.get(idx, 0) + 2
+
+        # The set collapses the squashed-name and 4-char-prefix hits into one +3
+        for value in set(self._raw.values(skin_lower)):
+            points = 5 if value[0] == NICKNAME else 3
+            scores[value[1]] = scores.get(value[1], 0) + points
+
+        matches = [(self.names[idx], scores[idx]) for idx in sorted(scores) if scores[idx] > 0]
+        return sorted(matches, key=lambda x: x[1], reverse=True)
+
+    def score_many(self, skin_names):
+        return [self.score(skin_name) for skin_name in skin_names]
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+
+class ChampionSnapshot:
+    __slots__ = ('version', 'loaded_at', 'names', 'name_set', 'lower', 'stripped', 'longest_first', 'by_lower')
+
+    def __init__(self, names, version=0, loaded_at=0.0):
+        self.version = version
+        self.loaded_at = loaded_at
+        self.names = tuple(sorted(names))
+        self.name_set = frozenset(self.names)
+        self.lower = tuple(name.lower() for name in self.names)
+        self.stripped = tuple(name.replace("'", "") for name in self.lower)
+        # sorted() is stable, so equal-length names keep their alphabetical order
+        self.longest_first = tuple(sorted(self.names, key=len, reverse=True))
+        self.by_lower = {name.lower(): name for name in self.names}
+
+    def __len__(self):
+        return len(self.names)
+
+
+class ChampionRegistry:
+    def __init__(self, loader, ttl=3600, fallback=("Alistar",)):
+        self._loader = loader
+        self.ttl = ttl
+        self._fallback = ChampionSnapshot(fallback)
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._refresh_guard = threading.Lock()
+        self._refreshing = False
+        self._retry_at = 0.0
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Cold: one caller loads while the rest wait on the lock for its result. After a
+            # failure everyone gets the fallback until _retry_at, rather than each caller
+            # queueing behind another timeout.
+            if time.time() < self._retry_at:
+                return self._fallback
+            with self._lock:
+                if self._snapshot is None and time.time() >= self._retry_at:
+                    self._load()
+                snapshot = self._snapshot
+            if snapshot is None:
+                return self._fallback
+        else:
+            now = time.time()
+            if now - snapshot.loaded_at > self.ttl and now >= self._retry_at:
+                self._refresh_in_background()
+        return snapshot
+
+    def names(self):
+        return list(self.snapshot().names)
+
+    def refresh(self):
+        with self._lock:
+            return self._load()
+
+    def reset(self):
+        # Forget the loaded list and any backoff; the next snapshot() loads again
+        with self._lock:
+            self._snapshot = None
+            self._retry_at = 0.0
+
+    def _load(self):
+        try:
+            names = self._loader()
+        except Exception as e:
+            logging.error(f"Error loading champion list: {e}")
+            names = None
+        if not names:
+            logging.error("Champion registry load failed, keeping previous list")
+            self._retry_at = time.time() + min(self.ttl, 60)
+            return False
+
+        self._version += 1
+        self._snapshot = ChampionSnapshot(names, version=self._version, loaded_at=time.time())
+        logging.debug(f"Champion registry loaded {len(self._snapshot)} champions (version {self._version})")
+        return True
+
+    def _refresh_in_background(self):
+        # A separate guard keeps readers from blocking on a slow reload
+        with self._refresh_guard:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.error(f"Error refreshing champion registry: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name='champion-registry-refresh', daemon=True).start()
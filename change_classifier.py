@@ -0,0 +1,23 @@
+class ChangeClassifier:
+    def __init__(self, categories):
+        # categories: {bit: keywords}. A keyword containing another keyword of the same
+        # category can never change that category's verdict, so it is dropped; keywords
+        # shared between categories are checked once with their bits merged.
+        masks = {}
+        for bit, keywords in categories.items():
+            keywords = {keyword.lower() for keyword in keywords}
+            for keyword in keywords:
+                if not any(other != keyword and other in keyword for other in keywords):
+                    masks[keyword] = masks.get(keyword, 0) | bit
+
+        self.keywords = tuple(sorted(masks.items()))
+
+    def scan(self, text_lower):
+        mask = 0
+        for keyword, bits in self.keywords:
+            if keyword in text_lower:
+                mask |= bits
+        return mask
+
+    def __len__(self):
+        return len(self.keywords)
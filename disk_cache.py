@@ -0,0 +1,41 @@
+import json
+import logging
+import os
+import tempfile
+
+CACHE_DIR = os.environ.get(
+    'LOL_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+
+def cache_path(name):
+    return os.path.join(CACHE_DIR, name)
+
+def load_json(name, default=None):
+    path = cache_path(name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logging.error(f"Error reading cache file {path}: {e}")
+        return default
+
+def save_json(name, data):
+    path = cache_path(name)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file first so readers never see a half-written cache
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+    except OSError as e:
+        logging.error(f"Error writing cache file {path}: {e}")
+        return False
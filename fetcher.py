@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+import wiki_transport
+from lru_cache import LRUCache
+
+MAX_WORKERS = int(os.environ.get('FETCH_MAX_WORKERS', 8))
+PER_HOST_LIMIT = int(os.environ.get('FETCH_PER_HOST_LIMIT', 4))
+# Room for a refresh cycle over every champion's history (about 170) plus the season pages,
+# the champion list and the skins table; an LRU smaller than one cycle never revalidates anything
+VALIDATED_ENTRIES = int(os.environ.get('FETCH_VALIDATED_ENTRIES', 256))
+
+_host_semaphores = {}
+_host_lock = threading.Lock()
+
+# One keep-alive session for the whole process; urllib3's connection pool is
+# thread-safe and sized so every permitted concurrent request keeps its socket.
+# WIKI_TRANSPORT swaps the network for recorded fixtures or a local stand-in.
+_session = requests.Session()
+
+def set_adapter(adapter):
+    global _adapter
+    _adapter = adapter
+    _session.mount('https://', adapter)
+    _session.mount('http://', adapter)
+
+set_adapter(wiki_transport.make_adapter(pool_maxsize=max(MAX_WORKERS, PER_HOST_LIMIT)))
+
+# url -> (ETag, Last-Modified, parsed value) of the last 200 seen through fetch_parsed.
+# Bounded, so a parsed page evicted from the data caches is not kept alive here forever;
+# losing an entry only costs one full fetch instead of a 304.
+_validated = LRUCache(max_entries=VALIDATED_ENTRIES, ttl=float('inf'))
+
+def validator_stats():
+    return _validated.stats()
+
+def reset_validators():
+    _validated.clear()
+
+class Page:
+    __slots__ = ('status_code', 'value', 'not_modified')
+
+    def __init__(self, status_code, value=None, not_modified=False):
+        self.status_code = status_code
+        self.value = value
+        self.not_modified = not_modified
+
+def _host_semaphore(url):
+    host = urlsplit(url).netloc
+    with _host_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(PER_HOST_LIMIT)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+def fetch(url, timeout=10, headers=None):
+    # The per-host cap is process-wide, so parallel callers never pile more than
+    # PER_HOST_LIMIT requests onto the wiki at once
+    with _host_semaphore(url):
+        return _session.get(url, timeout=timeout, headers=headers)
+
+def fetch_parsed(url, parse, timeout=10):
+    # Revalidates against the last 200 for this url; a 304 hands back the value
+    # parse() produced then, so an unchanged page costs headers only. Callers
+    # share that value and must not mutate it.
+    entry = _validated.get(url)
+
+    headers = {}
+    if entry is not None:
+        etag, last_modified, _ = entry
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    response = fetch(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        logging.debug(f"Not modified, reusing parsed result for {url}")
+        return Page(200, entry[2], not_modified=True)
+    if response.status_code != 200:
+        return Page(response.status_code)
+
+    value = parse(response.content)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if value is not None and (etag or last_modified):
+        _validated.put(url, (etag, last_modified, value))
+    return Page(200, value)
+
+def map_urls(func, urls, max_workers=None):
+    urls = list(urls)
+    if not urls:
+        return []
+
+    workers = min(max_workers or MAX_WORKERS, len(urls))
+
+    def run(url):
+        try:
+            return func(url)
+        except Exception as e:
+            logging.error(f"Error fetching {url}: {e}")
+            return None
+
+    if workers <= 1:
+        return [run(url) for url in urls]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wiki-fetch') as executor:
+        # executor.map keeps results in input order regardless of completion order
+        return list(executor.map(run, urls))
+
+def fetch_all(urls, timeout=10, max_workers=None):
+    return map_urls(lambda url: fetch(url, timeout=timeout), urls, max_workers=max_workers)
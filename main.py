@@ -2,15 +2,15 @@ from flask import Flask, render_template, request, jsonify
 import sys
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+import threading
+
+import refresher
+import snapshot_store
 
 from patch_data import (
-    get_champions_list, get_patch_data, is_game_mode_related,
-    is_bug_fix_only, is_animation_update, is_model_texture_update,
-    extract_date
+    get_champions_list, get_patch_data, audit_patch_data, patch_cache_stats
 )
-from skin_data import get_all_skins_data, get_champion_skins
+from skin_data import get_all_skins_data, get_champion_skins, get_skins_view, assign_skin
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -38,124 +38,16 @@ def patches():
 def skins():
     try:
         champions = get_champions_list()
-        from skin_data import get_all_skins_data, find_potential_champion_matches, CUSTOM_SKIN_MAPPINGS
-        all_skins_data = get_all_skins_data()
-        
-        if not all_skins_data:
-            return render_template('error.html', error_message="Could not retrieve skins data. Please try again later.")
+        view = get_skins_view()
 
-        for skin_name, champion_name in CUSTOM_SKIN_MAPPINGS.items():
-            found_skin = None
-            found_in_category = None
-
-            for category, skins in all_skins_data.items():
-                if not isinstance(skins, list):
-                    continue  # Skip if not a list
-                    
-                for skin in skins:
-                    if not isinstance(skin, dict) or "name" not in skin:
-                        continue  # Skip invalid skin entries
-                        
-                    if skin["name"] == skin_name:
-                        found_skin = skin
-                        found_in_category = category
-                        break
-                if found_skin:
-                    break
-
-            if found_skin and found_in_category:
-                if champion_name not in all_skins_data:
-                    all_skins_data[champion_name] = []
-                all_skins_data[champion_name].append(found_skin)
-
-                all_skins_data[found_in_category] = [
-                    skin for skin in all_skins_data[found_in_category] 
-                    if skin["name"] != skin_name
-                ]
-
-                if not all_skins_data[found_in_category]:
-                    del all_skins_data[found_in_category]
-
-            elif not found_skin:
-                from skin_data import parse_date
-                release_date = "Unknown"
-
-                for category, skins_list in all_skins_data.items():
-                    for skin in skins_list:
-                        if skin["name"].lower() == skin_name.lower():
-                            release_date = skin["release_date"]
-                            break
-
-                if release_date == "Unknown":
-                    url = "https://wiki.leagueoflegends.com/en-us/List_of_champion_skins"
-                    try:
-                        response = requests.get(url, timeout=10)
-                        if response.status_code == 200:
-                            soup = BeautifulSoup(response.content, 'html.parser')
-                            rows = soup.select('table.sortable.article-table.nopadding tr')
-                            for row in rows:
-                                cells = row.find_all(['td', 'th'])
-                                if len(cells) > 1:
-                                    table_skin_name = cells[1].get_text(strip=True)
-                                    if table_skin_name.lower() == skin_name.lower():
-                                        if len(cells) > 2:
-                                            date_cell = cells[2]
-                                            date_links = date_cell.find_all('a')
-                                            for link in date_links:
-                                                link_text = link.get_text(strip=True)
-                                                if re.match(r'\d{1,2}-[A-Za-z]{3}-\d{4}', link_text):
-                                                    release_date = link_text
-                                                    break
-                    except Exception as e:
-                        logging.error(f"Error fetching wiki data for custom mapping: {e}")
-
-                if champion_name not in all_skins_data:
-                    all_skins_data[champion_name] = []
-                all_skins_data[champion_name].append({
-                    "name": skin_name,
-                    "release_date": release_date
-                })
-
-        if "Other" in all_skins_data:
-            skins_to_move = {}
-
-            for skin in all_skins_data["Other"]:
-                if skin["name"] in CUSTOM_SKIN_MAPPINGS:
-                    continue
-
-                matches = find_potential_champion_matches(skin["name"])
-                if matches:
-                    best_match, score = matches[0]
-                    if score > 2:
-                        if best_match not in skins_to_move:
-                            skins_to_move[best_match] = []
-                        skins_to_move[best_match].append(skin)
-
-            for champion, skins_list in skins_to_move.items():
-                if champion not in all_skins_data:
-                    all_skins_data[champion] = []
-                for skin in skins_list:
-                    all_skins_data[champion].append(skin)
-
-            if "Other" in all_skins_data:
-                all_skins_data["Other"] = [skin for skin in all_skins_data["Other"]
-                                          if not any(skin in champion_skins 
-                                                  for champion, champion_skins in skins_to_move.items())]
-                if not all_skins_data["Other"]:
-                    del all_skins_data["Other"]
-
-        potential_matches = {}
-        if "Other" in all_skins_data:
-            for skin in all_skins_data["Other"]:
-                matches = find_potential_champion_matches(skin["name"])
-                if matches:
-                    potential_matches[skin["name"]] = matches[:3]
+        if view is None:
+            return render_template('error.html', error_message="Could not retrieve skins data. Please try again later.")
 
         return render_template('skins.html',
-                            skins=all_skins_data,
+                            skins=view.skins,
                             champions=champions,
                             current_champion=None,
-                            potential_matches=potential_matches,
+                            potential_matches=view.potential_matches,
                             error_message=None)
     except Exception as e:
         logging.error(f"Error in skins route: {e}")
@@ -173,6 +65,14 @@ def debug_skins():
         logging.error(f"Error in debug skins route: {e}")
         return jsonify({'error': str(e)})
 
+@app.route('/debug/cache')
+def debug_cache():
+    return jsonify(patch_cache_stats())
+
+@app.route('/debug/refresh')
+def debug_refresh():
+    return jsonify(dict(refresher.status(), snapshots=snapshot_store.status()))
+
 @app.route('/debug')
 def debug_patches():
     try:
@@ -180,55 +80,11 @@ def debug_patches():
         # Always show all patches by default
         show_all = True
 
-        url = f"https://wiki.leagueoflegends.com/en-us/{champion}/Patch_history"
-        response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        patch_history = soup.find('div', {'class': 'mw-parser-output'})
-        all_patches = []
-
-        for dl_element in patch_history.find_all('dl'):
-            dt_element = dl_element.find('dt')
-            if not dt_element:
-                continue
-
-            version_text = dt_element.get_text().strip()
-            changes = []
-            next_element = dl_element.find_next_sibling()
-
-            while next_element and next_element.name != 'dl':
-                if next_element.name == 'ul':
-                    for li in next_element.find_all('li'):
-                        text = li.get_text().strip()
-                        if text:
-                            changes.append(text)
-                next_element = next_element.find_next_sibling()
-
-            if changes:
-                date = extract_date(version_text)
-                all_patches.append({
-                    'version': version_text,
-                    'date': date if date is not None else "",
-                    'changes': changes
-                })
-
-        from patch_data import is_bug_fix_only
-
-        def no_filter(*args, **kwargs):
-            return False
-
-        original_is_bug_fix_only = is_bug_fix_only
-        import patch_data
-        patch_data.is_bug_fix_only = no_filter
-
-        filtered_patches = get_patch_data(champion, include_undocumented=True, exclude_art_sustainability=True, exclude_alpha_v1=True)
-
-        patch_data.is_bug_fix_only = original_is_bug_fix_only
-
-        filtered_patches_dict = {patch['version']: patch for patch in filtered_patches}
-        all_patches_dict = {patch['version']: patch for patch in all_patches}
-
-        excluded_patches = [patch for patch in all_patches if patch['version'] not in filtered_patches_dict]
+        # Same flags as /patches, so the audit also warms that page's cache entry
+        audit = audit_patch_data(champion, include_undocumented=True, exclude_art_sustainability=True, exclude_alpha_v1=True)
+        if audit is None:
+            return jsonify({'error': f"Could not load patch history for {champion}"})
+        filtered_patches, all_patches_status = audit
 
         categorized_exclusions = {
             "art_sustainability": [],
@@ -238,74 +94,21 @@ def debug_patches():
             "animation_only": [],
             "model_texture_only": [],
             "no_numerical_values": [],
+            "duplicate_changes": [],
             "other": []
         }
+        for patch_info in all_patches_status:
+            if not patch_info['included']:
+                categorized_exclusions[patch_info['category']].append(patch_info['patch'])
 
-        patch_categories = {}
-
-        month_names = ['january', 'february', 'march', 'april', 'may', 'june', 
-                      'july', 'august', 'september', 'october', 'november', 'december',
-                      'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-
-        filtered_versions = {patch['version'] for patch in filtered_patches}
-
-        for patch in excluded_patches:
-            version = patch['version'].lower()
-            changes = patch['changes']
-
-            if "art & sustainability" in version:
-                category = "art_sustainability"
-            elif ('alpha' in version or 
-                  re.match(r'v?0\.\d+', version) or 
-                  re.match(r'v?1\.\d+', version) or
-                  any(version.strip().startswith(month) for month in month_names)):
-                category = "alpha_v0_v1_month_patches"
-            elif is_game_mode_related(patch['version'], changes):
-                category = "game_mode_only"
-            elif is_bug_fix_only(changes):
-                category = "bug_fix_only"
-            elif is_animation_update(changes):
-                category = "animation_only"
-            elif is_model_texture_update(changes):
-                category = "model_texture_only"
-            elif not any(re.search(r'\d+', change) for change in changes):
-                category = "no_numerical_values"
-            else:
-                category = "other"
-
-            categorized_exclusions[category].append(patch)
-            patch_categories[patch['version']] = category
-
-        all_patches_status = []
-        for patch in all_patches:
-            is_included = patch['version'] in filtered_patches_dict
-            category = patch_categories.get(patch['version'], "included") if not is_included else "included"
-            all_patches_status.append({
-                'patch': patch,
-                'included': is_included,
-                'category': category
-            })
-
-        def version_key(patch_info):
-            version_str = patch_info['patch']['version'].lower().replace('v', '')
-            if ' - ' in version_str:
-                version_str = version_str.split(' - ')[0]
-            try:
-                parts = [int(part) for part in version_str.split('.')]
-                while len(parts) < 3:
-                    parts.append(0)
-                return parts
-            except (ValueError, AttributeError):
-                return [0, 0, 0]
-
-        all_patches_status.sort(key=version_key, reverse=True)
+        excluded_count = sum(len(patches) for patches in categorized_exclusions.values())
 
         return render_template('debug.html', 
                               champion=champion,
                               show_all=show_all,
-                              all_count=len(all_patches),
+                              all_count=len(all_patches_status),
                               filtered_count=len(filtered_patches),
-                              excluded_count=len(excluded_patches),
+                              excluded_count=excluded_count,
                               categorized=categorized_exclusions,
                               all_patches_status=all_patches_status)
 
@@ -323,11 +126,10 @@ def assign_skin_champion():
         skin_name = data['skin_name']
         champion_name = data['champion_name']
 
-        from skin_data import CUSTOM_SKIN_MAPPINGS
-        CUSTOM_SKIN_MAPPINGS[skin_name] = champion_name
+        persisted = assign_skin(skin_name, champion_name)
 
         logging.info(f"Assigned skin '{skin_name}' to champion '{champion_name}'")
-        return jsonify({'success': True})
+        return jsonify({'success': True, 'persisted': persisted})
     except Exception as e:
         logging.error(f"Error in assign_skin_champion route: {e}")
         return jsonify({'success': False, 'error': str(e)})
@@ -425,6 +227,33 @@ def analytics():
         logging.error(f"Error in analytics route: {e}")
         return render_template('error.html', error_message=f"An error occurred: {str(e)}")
 
+_refresh_pid = None
+_refresh_lock = threading.Lock()
+
+def start_background_refresh():
+    # Warms every dataset and keeps it refreshed off the request path, once per process; with
+    # SHARED_SNAPSHOTS only the elected writer process runs the scheduler
+    global _refresh_pid
+    if os.environ.get('BACKGROUND_REFRESH', '1') == '0' or _refresh_pid == os.getpid():
+        return
+    with _refresh_lock:
+        if _refresh_pid == os.getpid():
+            return
+        _refresh_pid = os.getpid()
+    snapshot_store.elect_writer(refresher.scheduler.start)
+
+if snapshot_store.store is None:
+    # A single process warms up at startup. Under the debug reloader only the serving child
+    # process runs the scheduler, not the file-watching parent.
+    if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_refresh()
+else:
+    # Shared snapshots elect their writer after any fork, on each worker's first request, so a
+    # gunicorn --preload master never holds an election its workers would inherit
+    @app.before_request
+    def _start_background_refresh():
+        start_background_refresh()
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
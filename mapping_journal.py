@@ -0,0 +1,62 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import disk_cache
+
+
+class MappingJournal:
+    def __init__(self, path):
+        # Append-only JSON lines; each worker tails the file from its own offset
+        self.path = path
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def append(self, skin_name, champion_name):
+        record = json.dumps({'skin': skin_name, 'champion': champion_name, 'at': round(time.time(), 3)})
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # One write() of one line in O_APPEND mode, so concurrent workers never interleave records
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, (record + '\n').encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            return True
+        except OSError as e:
+            logging.error(f"Error appending to mapping journal {self.path}: {e}")
+            return False
+
+    def read_new(self):
+        # [(skin, champion)] appended since the last call, by any process
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) <= self._offset:
+                    return []
+                with open(self.path, 'rb') as f:
+                    f.seek(self._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return []
+            except OSError as e:
+                logging.error(f"Error reading mapping journal {self.path}: {e}")
+                return []
+
+            # A line still being written is left for the next call
+            end = data.rfind(b'\n') + 1
+            self._offset += end
+
+        mappings = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+                mappings.append((record['skin'], record['champion']))
+            except (ValueError, KeyError, TypeError) as e:
+                logging.error(f"Skipping bad mapping journal record {line[:80]!r}: {e}")
+        return mappings
+
+
+journal = MappingJournal(disk_cache.cache_path(os.environ.get('SKIN_MAPPINGS_JOURNAL', 'skin_mappings.jsonl')))
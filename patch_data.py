@@ -1,430 +1,603 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
+import functools
+import itertools
 import logging
+import os
+import threading
+import time
+
+from change_classifier import ChangeClassifier
+from champion_registry import ChampionRegistry
+from lru_cache import LRUCache
+from patch_version import index_by_version, patch_version
+from single_flight import flights
+import disk_cache
+import fetcher
+import refresher
+import snapshot_store
+import wiki_html
 
 logging.basicConfig(level=logging.DEBUG)
 
-def get_champions_list():
-    try:
-        url = "https://wiki.leagueoflegends.com/en-us/Category:LoL_patch_history"
-        logging.debug(f"Fetching champions list from: {url}")
-
-        response = requests.get(url, timeout=10)  
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch champions list, status code: {response.status_code}")
-            return ["Aatrox"]  
+CHAMPIONS_TTL = int(os.environ.get('CHAMPIONS_TTL', 6 * 3600))
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        logging.debug(f"Successfully fetched HTML content, length: {len(response.content)}")
+def fetch_champions_list():
+    shared = snapshot_store.latest('champions')
+    if shared is not None and time.time() - shared.written_at <= CHAMPIONS_TTL:
+        return shared.value
 
-        champion_links = soup.select('.mw-category-group li a')
-        logging.debug(f"Found {len(champion_links)} potential champion links")
+    champions = flights.do('champions', _fetch_champions_list)
+    if champions:
+        snapshot_store.publish('champions', champions)
+    return champions
 
-        champions = set()  
-
-        for link in champion_links:
-            champion_name = link.text.split('/')[0].strip()
-            if champion_name and not champion_name.startswith("Category:"):
-                champions.add(champion_name)
+def _fetch_champions_list():
+    try:
+        url = "https://wiki.leagueoflegends.com/en-us/Category:LoL_patch_history"
+        logging.debug(f"Fetching champions list from: {url}")
 
-        if not champions:
-            logging.error("Failed to extract champions from the category page")
-            return ["Alistar"]
+        page = fetcher.fetch_parsed(url, parse_champions_list, timeout=10)
+        if page.status_code != 200:
+            logging.error(f"Failed to fetch champions list, status code: {page.status_code}")
+            return None
 
-        return sorted(champions)  
+        return page.value
     except Exception as e:
         logging.error(f"Error fetching champions list: {e}")
-        return ["Alistar"]
+        return None
 
-def is_bug_fix_only(changes):
-    if not changes:
-        return False
+def parse_champions_list(content):
+    soup = wiki_html.parse(content, wiki_html.CATEGORY_GROUPS)
+    logging.debug(f"Successfully fetched HTML content, length: {len(content)}")
 
-    for change in changes:
-        change_lower = change.lower()
+    champion_links = soup.select('.mw-category-group li a')
+    logging.debug(f"Found {len(champion_links)} potential champion links")
 
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
-            continue
+    champions = set()  
 
-        if not any(keyword in change_lower for keyword in bug_fix_keywords):
-            return False
+    for link in champion_links:
+        champion_name = link.text.split('/')[0].strip()
+        if champion_name and not champion_name.startswith("Category:"):
+            champions.add(champion_name)
 
-    return True
+    if not champions:
+        logging.error("Failed to extract champions from the category page")
+        return None
 
-def is_undocumented(changes):
-    undocumented_keywords = [
-        'undocumented', 'unlisted', 'not documented', 'not listed',
-        'no patch notes', 'unreleased'
-    ]
-    if not changes:
-        return False
+    return sorted(champions)  
 
-    for change in changes:
-        change_lower = change.lower()
+champion_registry = ChampionRegistry(fetch_champions_list, ttl=CHAMPIONS_TTL, fallback=["Alistar"])
 
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
+def get_champions_list():
+    return champion_registry.names()
+
+BUG_FIX = 1 << 0
+UNDOCUMENTED = 1 << 1
+ICON_HUD = 1 << 2
+TOOLTIP = 1 << 3
+RECOMMENDED_ITEMS = 1 << 4
+SPLASH_ARTWORK = 1 << 5
+ANIMATION = 1 << 6
+MODEL_TEXTURE = 1 << 7
+GAME_MODE = 1 << 8
+ABILITY_CHANGE = 1 << 9
+# Raw keyword hits; the composite categories above need a keyword and a hint word
+ANIMATION_WORD = 1 << 10
+MODEL_TEXTURE_WORD = 1 << 11
+_HUD_WORD = 1 << 12
+_HUD_HINT = 1 << 13
+_TOOLTIP_WORD = 1 << 14
+_TOOLTIP_HINT = 1 << 15
+_ITEM_WORD = 1 << 16
+_ITEM_HINT = 1 << 17
+_SPLASH_WORD = 1 << 18
+_SPLASH_HINT = 1 << 19
+_ANIMATION_HINT = 1 << 20
+_MODEL_TEXTURE_HINT = 1 << 21
+# Verdicts of the numeric and stat-change detectors, folded into the same cached mask
+NUMERIC_VALUE = 1 << 22
+STAT_CHANGE = 1 << 23
+_NUMERIC_STAT_WORD = 1 << 24
+_STAT_VERB = 1 << 25
+_STAT_NOUN = 1 << 26
+_ADDED = 1 << 27
+_ADDED_TO_GAME = 1 << 28
+
+_DIGIT_RE = re.compile(r'\d')
+# Each is the shortest form of the old pattern: any match of \d+\s*/\s*\d+ contains
+# one of \d\s*/\s*\d, and likewise for (\d+)[%] and (\d+\.?\d*)[\s]*[+-]
+_SLASHED_RE = re.compile(r'\d\s*/\s*\d')
+_PERCENT_RE = re.compile(r'\d%')
+_SIGNED_RE = re.compile(r'\d\.?\d*\s*[+-]')
+_BOUNDED_NUMBER_RE = re.compile(r'\b\d+\.?\d*\b')
+
+def _has_number_around(change, word):
+    # Linear stand-in for re.search(r'(\d+).*WORD.*(\d+)'): a digit, WORD after it and
+    # a digit after WORD on the same line ('.' never crosses a newline)
+    for line in change.split('\n') if '\n' in change else (change,):
+        first_digit = _DIGIT_RE.search(line)
+        if first_digit is None:
             continue
-
-        if any(keyword in change_lower for keyword in undocumented_keywords):
+        at = line.find(word, first_digit.end())
+        if at != -1 and _DIGIT_RE.search(line, at + len(word)):
             return True
-
     return False
 
-def is_ability_icon_hud(changes):
-    hud_keywords = [
-        'hud', 'interface', 'user interface', 'ui', 'icon', 'icons',
-        'ability icon', 'visual update', 'visual effect', 'visual display',
-        'ability art', 'portrait', 'minimap icon'
-    ]
-
+def _numeric_bits(change, found):
+    paired = (_SLASHED_RE.search(change) is not None or
+              _has_number_around(change, 'from') or
+              _has_number_around(change, 'to'))
+
+    mask = 0
+    if (paired or
+        _PERCENT_RE.search(change) or
+        _SIGNED_RE.search(change) or
+        (found & _NUMERIC_STAT_WORD and _BOUNDED_NUMBER_RE.search(change))):
+        mask |= NUMERIC_VALUE
+
+    if (paired or
+        found & _STAT_VERB or
+        (found & _ADDED and not found & _ADDED_TO_GAME) or
+        (found & _STAT_NOUN and _DIGIT_RE.search(change))):
+        mask |= STAT_CHANGE
+    return mask
+
+@functools.lru_cache(maxsize=16384)
+def classify_change(change):
+    found = _change_classifier.scan(change.lower())
+    mask = found & (BUG_FIX | UNDOCUMENTED | GAME_MODE | ANIMATION_WORD | MODEL_TEXTURE_WORD)
+    for category, word, hint in _COMPOSITE_CATEGORIES:
+        if found & word and found & hint:
+            mask |= category
+
+    if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
+        mask |= ABILITY_CHANGE
+    return mask | _numeric_bits(change, found)
+
+def _every_change(changes, category):
     if not changes:
         return False
 
     for change in changes:
-        change_lower = change.lower()
-
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
+        mask = classify_change(change)
+        if mask & ABILITY_CHANGE:
             continue
-
-        if any(keyword in change_lower for keyword in hud_keywords) and ('icon' in change_lower or 'hud' in change_lower or 'ui' in change_lower):
-            return True
-
-    return False
-
-def is_tooltip_update(changes):
-    tooltip_keywords = [
-        'tooltip', 'description', 'text', 'wording', 'description text',
-        'ability description', 'tooltip text', 'description updated',
-        'tooltip updated', 'text updated', 'wording updated'
-    ]
-
-    if not changes:
-        return False
-
-    for change in changes:
-        change_lower = change.lower()
-
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
-            continue
-
-        if not any(keyword in change_lower for keyword in tooltip_keywords) or not ('tooltip' in change_lower or 'text' in change_lower or 'description' in change_lower):
+        if not mask & category:
             return False
 
     return True
 
-def is_recommended_items_update(changes):
-    item_keywords = [
-        'recommended', 'item', 'items', 'recommended items',
-        'item build', 'recommended build', 'item recommendation',
-        'item set', 'item loadout'
-    ]
-
+def _any_change(changes, category):
     if not changes:
         return False
 
     for change in changes:
-        change_lower = change.lower()
-
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
+        mask = classify_change(change)
+        if mask & ABILITY_CHANGE:
             continue
-
-        if any(keyword in change_lower for keyword in item_keywords) and ('recommend' in change_lower or 'item' in change_lower):
+        if mask & category:
             return True
 
     return False
 
-def is_splash_artwork_update(changes):
-    splash_keywords = [
-        'splash', 'artwork', 'splash art', 'splash artwork', 'art',
-        'artwork updated', 'updated artwork', 'updated splash',
-        'visual update', 'splash screen', 'portrait', 'champion portrait',
-        'splash image', 'loading screen'
-    ]
+def is_bug_fix_only(changes):
+    return _every_change(changes, BUG_FIX)
 
-    if not changes:
-        return False
+def is_undocumented(changes):
+    return _any_change(changes, UNDOCUMENTED)
 
-    for change in changes:
-        change_lower = change.lower()
+def is_ability_icon_hud(changes):
+    return _any_change(changes, ICON_HUD)
 
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
-            continue
+def is_tooltip_update(changes):
+    return _every_change(changes, TOOLTIP)
 
-        if not any(keyword in change_lower for keyword in splash_keywords) or not ('splash' in change_lower or 'art' in change_lower or 'portrait' in change_lower or 'loading screen' in change_lower):
-            return False
+def is_recommended_items_update(changes):
+    return _any_change(changes, RECOMMENDED_ITEMS)
 
-    return True
+def is_splash_artwork_update(changes):
+    return _every_change(changes, SPLASH_ARTWORK)
 
 def is_animation_update(changes):
-    if not changes:
-        return False
-
-    for change in changes:
-        change_lower = change.lower()
-
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
-            continue
-
-        if not any(keyword in change_lower for keyword in animation_keywords) or not ('animation' in change_lower or 'visual' in change_lower or 'effect' in change_lower or 'vfx' in change_lower or 'particle' in change_lower):
-            return False
-
-    return True
+    return _every_change(changes, ANIMATION)
 
 def is_model_texture_update(changes):
-    if not changes:
-        return False
-
-    for change in changes:
-        change_lower = change.lower()
-
-        if ':' in change and change.split(':')[0].strip().endswith(('Q', 'W', 'E', 'R', 'Passive')):
-            continue
-
-        if not any(keyword in change_lower for keyword in model_texture_keywords) or not ('model' in change_lower or 'texture' in change_lower or 'visual' in change_lower):
-            return False
-
-    return True
+    return _every_change(changes, MODEL_TEXTURE)
 
 def is_game_mode_related(version_text, changes):
-    if any(keyword in version_text.lower() for keyword in game_mode_keywords):
+    if classify_change(version_text) & GAME_MODE:
         return True
 
     if changes:
         for change in changes:
-            change_lower = change.lower()
-            if not any(keyword in change_lower for keyword in game_mode_keywords):
+            if not classify_change(change) & GAME_MODE:
                 return False
         return True
 
     return False
 
-def get_patch_data(champion_name, include_undocumented=True, exclude_art_sustainability=False, exclude_alpha_v1=True):
-    try:
-        url = f"https://wiki.leagueoflegends.com/en-us/{champion_name}/Patch_history"
-        logging.debug(f"Fetching patch data from: {url}")
+def parse_patch_history(content):
+    # (version text, change texts) for every linked <dt>; everything that depends on
+    # the request flags happens later, so one parse serves every filter combination
+    soup = wiki_html.parse(content, wiki_html.PARSER_OUTPUT)
+    patch_history = soup.find('div', {'class': 'mw-parser-output'})
+    if not patch_history:
+        return None
+
+    entries = []
+    for dl_element in patch_history.find_all('dl'):
+        dt_element = dl_element.find('dt')
+        if not dt_element:
+            continue
 
-        # Get patch dates from wiki pages
-        patch_dates = get_patch_dates()
-        logging.debug(f"Loaded {len(patch_dates)} patch dates from wiki pages")
+        version_text = dt_element.get_text().strip()
+        version_link = dt_element.find('a')
+        if not version_link:
+            continue
 
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch patch data for {champion_name}, status code: {response.status_code}")
-            return []
+        change_texts = []
+        next_element = dl_element.find_next_sibling()
+
+        while next_element and next_element.name != 'dl':
+            if next_element.name == 'ul':
+                for li in next_element.find_all('li'):
+                    change_texts.append(li.get_text().strip())
+            next_element = next_element.find_next_sibling()
+
+        entries.append((version_text, tuple(change_texts)))
+
+    soup.decompose()
+    return tuple(entries)
+
+PATCH_HISTORY_TTL = int(os.environ.get('PATCH_HISTORY_TTL', 1800))
+PATCH_HISTORY_ENTRIES = int(os.environ.get('PATCH_HISTORY_ENTRIES', 32))
+# Champions whose histories are fetched at startup and kept refreshed in the background
+HOT_CHAMPIONS = [name.strip() for name in os.environ.get('HOT_CHAMPIONS', 'Alistar').split(',') if name.strip()]
+
+# Parsed pages are keyed by champion alone, so changing a filter flag never refetches;
+# filtered results are keyed by champion plus every flag that shapes them
+_patch_histories = LRUCache(max_entries=PATCH_HISTORY_ENTRIES, ttl=PATCH_HISTORY_TTL)
+_patch_results = LRUCache(max_entries=PATCH_HISTORY_ENTRIES * 4, ttl=PATCH_HISTORY_TTL)
+
+def patch_cache_stats():
+    return {
+        'histories': _patch_histories.stats(),
+        'results': _patch_results.stats(),
+        'flights': flights.stats(),
+        'validators': fetcher.validator_stats(),
+    }
+
+def _fetch_patch_history(champion_name):
+    url = f"https://wiki.leagueoflegends.com/en-us/{champion_name}/Patch_history"
+    logging.debug(f"Fetching patch data from: {url}")
+
+    page = fetcher.fetch_parsed(url, parse_patch_history, timeout=10)
+    if page.status_code != 200:
+        logging.error(f"Failed to fetch patch data for {champion_name}, status code: {page.status_code}")
+        return None
+
+    if page.value is None:
+        logging.error("Could not find patch history section")
+        return None
+    logging.debug(f"Successfully fetched HTML content for {champion_name}")
+    return page.value
+
+def get_patch_history(champion_name):
+    history = _patch_histories.get(champion_name)
+    if history is not None:
+        return history
+
+    shared = snapshot_store.latest(f'patch_history:{champion_name}')
+    if shared is not None and time.time() - shared.written_at <= PATCH_HISTORY_TTL:
+        history = tuple((version, tuple(changes)) for version, changes in shared.value)
+        _patch_histories.put(champion_name, history)
+        return history
+
+    history = flights.do(('patch_history', champion_name), _fetch_patch_history, champion_name)
+    if history is not None:
+        _patch_histories.put(champion_name, history)
+    return history
+
+def refresh_patch_history(champion_name):
+    previous = _patch_histories.peek(champion_name)
+    history = flights.do(('patch_history', champion_name), _fetch_patch_history, champion_name)
+    if history is None:
+        if previous is not None:
+            # Keep serving the last good history rather than letting it expire
+            _patch_histories.put(champion_name, previous)
+        return False
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        logging.debug(f"Successfully fetched HTML content for {champion_name}")
+    _patch_histories.put(champion_name, history)
+    snapshot_store.publish(f'patch_history:{champion_name}', history)
+    if history != previous:
+        for flags in itertools.product((True, False), repeat=3):
+            _patch_results.discard((champion_name, *flags))
+    return True
 
-        patch_history = soup.find('div', {'class': 'mw-parser-output'})
-        if not patch_history:
-            logging.error("Could not find patch history section")
-            return []
+ALPHA_MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 
+                     'july', 'august', 'september', 'october', 'november', 'december',
+                     'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
 
-        patch_notes = []
-        seen_changes = set()
+def _stage_game_mode(patches):
+    kept = []
+    for patch in patches:
+        if is_game_mode_related(patch['version'], patch['changes']):
+            logging.debug(f"Filtering out {patch['version']} - Game mode related patch")
+            continue
+        kept.append(patch)
+    return kept
+
+def _stage_numeric(patches):
+    kept = []
+    for patch in patches:
+        numerical_changes = []
+        has_numerical_value = False
+
+        for change in patch['changes']:
+            mask = classify_change(change)
+            if mask & NUMERIC_VALUE:
+                has_numerical_value = True
+                numerical_changes.append(change)
+            elif not mask & (BUG_FIX | ANIMATION_WORD | MODEL_TEXTURE_WORD):
+                numerical_changes.append(change)
+
+        if has_numerical_value:  
+            patch['changes'] = numerical_changes
+            kept.append(patch)
+            logging.debug(f"Including {patch['version']} - Contains numerical gameplay changes")
+        else:
+            logging.debug(f"Filtering out {patch['version']} - No numerical gameplay changes")
+    return kept
+
+def _stage_undocumented(patches):
+    return [patch for patch in patches if not is_undocumented(patch['changes'])]
+
+def _stage_alpha_v1(patches):
+    return [patch for patch in patches
+            if not (
+                'alpha' in patch['version'].lower() or  
+                re.match(r'v?0\.\d+', patch['version'].lower()) or  
+                re.match(r'v?1\.\d+', patch['version'].lower()) or  
+                any(patch['version'].lower().strip().startswith(month) for month in ALPHA_MONTH_NAMES)  
+            )]
+
+def _stage_cosmetic(patches):
+    kept = []
+    for patch in patches:
+        has_stat_changes = any(classify_change(change) & STAT_CHANGE for change in patch['changes'])
+
+        if has_stat_changes:
+            kept.append(patch)
+            continue
 
-        for dl_element in patch_history.find_all('dl'):
-            dt_element = dl_element.find('dt')
-            if not dt_element:
-                continue
+        if (is_ability_icon_hud(patch['changes']) or
+            is_tooltip_update(patch['changes']) or
+            is_recommended_items_update(patch['changes']) or
+            is_splash_artwork_update(patch['changes'])):
+            logging.debug(f"Filtering out {patch['version']} - Contains only cosmetic or UI changes")
+            continue
 
-            version_text = dt_element.get_text().strip()
-            version_link = dt_element.find('a')
-            if not version_link:
-                continue
+        kept.append(patch)
+    return kept
+
+def filter_patches(patch_notes, include_undocumented=True, exclude_alpha_v1=True):
+    # Each stage makes one pass over the survivors of the previous one; the numeric
+    # stage trims patch['changes'] in place, and later stages see the trimmed list.
+    # The report lists every stage with the patches it dropped and how long it took.
+    stages = [('game mode', _stage_game_mode), ('numeric', _stage_numeric)]
+    if not include_undocumented:
+        stages.append(('undocumented', _stage_undocumented))
+    if exclude_alpha_v1:
+        stages.append(('alpha/v1', _stage_alpha_v1))
+    stages.append(('cosmetic', _stage_cosmetic))
+
+    patches = patch_notes
+    report = []
+    for name, stage in stages:
+        start = time.perf_counter()
+        kept = stage(patches)
+        elapsed = time.perf_counter() - start
+
+        dropped = len(patches) - len(kept)
+        excluded = []
+        if dropped:
+            kept_ids = {id(patch) for patch in kept}
+            excluded = [patch for patch in patches if id(patch) not in kept_ids]
+        report.append({'stage': name, 'dropped': dropped, 'seconds': elapsed, 'excluded': excluded})
+        logging.debug(f"Filter stage '{name}' dropped {dropped} of {len(patches)} patches in {elapsed * 1000:.2f} ms")
+        patches = kept
+
+    return patches, report
 
-            version = version_text
+def get_patch_data(champion_name, include_undocumented=True, exclude_art_sustainability=False, exclude_alpha_v1=True):
+    cache_key = (champion_name, include_undocumented, exclude_art_sustainability, exclude_alpha_v1)
+    cached = _patch_results.get(cache_key)
+    if cached is not None:
+        logging.debug(f"Using cached patch data for {champion_name}")
+        return list(cached)
+
+    # Concurrent misses for the same champion and flags share one build
+    return list(flights.do(('patch_data', cache_key), _build_patch_data, cache_key))
+
+def _record_skip(audit, version, change_texts, reason):
+    if audit is not None and any(change_texts):
+        audit.append((version, change_texts, None, reason))
+
+def _extract_patch_notes(history, patch_dates, exclude_art_sustainability, audit=None):
+    # If audit is a list, it receives one entry per history patch with changes, in page order:
+    # the note built for it, or None plus the reason it was skipped before filtering
+    patch_notes = []
+    seen_changes = set()
+
+    for version, change_texts in history:
+        if classify_change(version) & GAME_MODE:
+            logging.debug(f"Skipping game mode patch: {version}")
+            _record_skip(audit, version, change_texts, 'game_mode_only')
+            continue
 
-            if any(keyword in version.lower() for keyword in game_mode_keywords):
-                logging.debug(f"Skipping game mode patch: {version}")
+        if exclude_art_sustainability and "art & sustainability" in version.lower():
+            logging.debug(f"Skipping Art & Sustainability patch: {version}")
+            _record_skip(audit, version, change_texts, 'art_sustainability')
+            continue
+
+        logging.debug(f"Processing version: {version}")
+
+        changes = []
+
+        for text in change_texts:
+            if not text or text in seen_changes:
                 continue
 
-            if exclude_art_sustainability and "art & sustainability" in version.lower():
-                logging.debug(f"Skipping Art & Sustainability patch: {version}")
+            seen_changes.add(text)
+
+            if '<span class="inline-image' in text or '<span class="ability-icon' in text:
+                changes.append(text)
                 continue
 
-            logging.debug(f"Processing version: {version}")
-
-            changes = []
-            next_element = dl_element.find_next_sibling()
-
-            while next_element and next_element.name != 'dl':
-                if next_element.name == 'ul':
-                    for li in next_element.find_all('li'):
-                        text = li.get_text().strip()
-
-                        if not text or text in seen_changes:
-                            continue
-
-                        seen_changes.add(text)
-
-                        if '<span class="inline-image' in text or '<span class="ability-icon' in text:
-                            changes.append(text)
-                            continue
-
-                        if text.strip().startswith('<span class="template_sbc"><b>New Effect:</b></span>') or text.strip().startswith('New Effect:'):
-                            changes.append(text)
-                            continue
-
-                        if ':' in text:
-                            ability_parts = text.split(':', 1)
-                            ability_name = ability_parts[0].strip()
-                            ability_desc = ability_parts[1].strip()
-
-                            if ability_name in ["Stats", "General"]:
-                                changes.append(f"<strong>{ability_name}:</strong>")
-
-                                detail_changes = text.split('.')[:-1]  
-                                for detail in detail_changes:
-                                    if ':' in detail:
-                                        detail = detail.replace(f"{ability_name}:", "").strip()
-                                    if detail:
-                                        changes.append("• " + detail.strip() + ".")
-                                continue
-
-                            if "New Effect:" in ability_desc:
-                                ability_desc = re.sub(r'^.*?(New Effect:)', r'\1', ability_desc)
-
-                            ability_desc = ability_desc.replace("New Effect:", "\nNew Effect:")
-                            ability_desc = ability_desc.replace("Now triggers", "\nNow triggers")
-
-                            changes.append(f"{ability_name}: {ability_desc}")
-                        else:
-                            changes.append(text)
-
-                next_element = next_element.find_next_sibling()
-
-            if changes:
-                # Try to get date from wiki patch dates first, then fall back to extract_date
-                extracted_date = extract_date(version)
-                
-                # Try different version formats to match with patch_dates
-                clean_version = version.split(' - ')[0].strip() if ' - ' in version else version
-                wiki_date = None
-                
-                # Try exact match
-                if clean_version in patch_dates:
-                    wiki_date = patch_dates[clean_version]
-                else:
-                    # Try with or without 'v' prefix
-                    alt_version = 'v' + clean_version if not clean_version.startswith('v') else clean_version[1:]
-                    if alt_version in patch_dates:
-                        wiki_date = patch_dates[alt_version]
-                
-                patch_notes.append({
-                    'version': version,
-                    'date': wiki_date if wiki_date else extracted_date,
-                    'changes': changes
-                })
-
-        logging.debug(f"Initially extracted {len(patch_notes)} patches")
-
-        filtered_patches = []
-        for patch in patch_notes:
-            if is_game_mode_related(patch['version'], patch['changes']):
-                logging.debug(f"Filtering out {patch['version']} - Game mode related patch")
+            if text.strip().startswith('<span class="template_sbc"><b>New Effect:</b></span>') or text.strip().startswith('New Effect:'):
+                changes.append(text)
                 continue
 
-            numerical_changes = []
-            has_numerical_value = False
-
-            for change in patch['changes']:
-                if (re.search(r'\d+\s*/\s*\d+', change) or  
-                    re.search(r'(\d+).*from.*(\d+)', change) or  
-                    re.search(r'(\d+).*to.*(\d+)', change) or  
-                    re.search(r'(\d+)[%]', change) or  
-                    re.search(r'(\d+\.?\d*)[\s]*[+-]', change) or  
-                    (re.search(r'\b\d+\.?\d*\b', change) and  
-                     any(keyword in change.lower() for keyword in ['damage', 'health', 'mana', 'cooldown', 'range', 'speed', 'armor', 'resist']))):
-                    has_numerical_value = True
-                    numerical_changes.append(change)
-                elif not any(keyword in change.lower() 
-                            for keyword in bug_fix_keywords + animation_keywords + model_texture_keywords):
-                    numerical_changes.append(change)
-
-            if has_numerical_value:  
-                patch['changes'] = numerical_changes
-                filtered_patches.append(patch)
-                logging.debug(f"Including {patch['version']} - Contains numerical gameplay changes")
-            else:
-                logging.debug(f"Filtering out {patch['version']} - No numerical gameplay changes")
-
-            if not include_undocumented:
-                filtered_patches = [patch for patch in filtered_patches
-                                  if not is_undocumented(patch['changes'])]
-
-            if exclude_alpha_v1:
-                month_names = ['january', 'february', 'march', 'april', 'may', 'june', 
-                              'july', 'august', 'september', 'october', 'november', 'december',
-                              'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-
-                filtered_patches = [patch for patch in filtered_patches
-                                  if not (
-                                      'alpha' in patch['version'].lower() or  
-                                      re.match(r'v?0\.\d+', patch['version'].lower()) or  
-                                      re.match(r'v?1\.\d+', patch['version'].lower()) or  
-                                      any(patch['version'].lower().strip().startswith(month) for month in month_names)  
-                                  )]
-
-            final_patches = []
-            for patch in filtered_patches:
-                has_stat_changes = False
-                contains_only_cosmetic = True
-
-                for change in patch['changes']:
-                    change_lower = change.lower()
-
-                    if (re.search(r'\d+\s*/\s*\d+', change) or 
-                        re.search(r'(\d+).*from.*(\d+)', change) or
-                        re.search(r'(\d+).*to.*(\d+)', change) or
-                        ('increased' in change_lower) or 
-                        ('decreased' in change_lower) or
-                        ('reduced' in change_lower) or
-                        ('added' in change_lower and not 'added to the game' in change_lower) or
-                        ('bonus' in change_lower and re.search(r'\d+', change)) or
-                        ('cooldown' in change_lower and re.search(r'\d+', change)) or
-                        ('damage' in change_lower and re.search(r'\d+', change)) or
-                        ('mana' in change_lower and re.search(r'\d+', change))):
-                        has_stat_changes = True
-                        contains_only_cosmetic = False
-                        break
-
-                if has_stat_changes:
-                    final_patches.append(patch)
-                    continue
+            if ':' in text:
+                ability_parts = text.split(':', 1)
+                ability_name = ability_parts[0].strip()
+                ability_desc = ability_parts[1].strip()
+
+                if ability_name in ["Stats", "General"]:
+                    changes.append(f"<strong>{ability_name}:</strong>")
 
-                if (is_ability_icon_hud(patch['changes']) or
-                    is_tooltip_update(patch['changes']) or
-                    is_recommended_items_update(patch['changes']) or
-                    is_splash_artwork_update(patch['changes'])):
-                    logging.debug(f"Filtering out {patch['version']} - Contains only cosmetic or UI changes")
+                    detail_changes = text.split('.')[:-1]  
+                    for detail in detail_changes:
+                        if ':' in detail:
+                            detail = detail.replace(f"{ability_name}:", "").strip()
+                        if detail:
+                            changes.append("• " + detail.strip() + ".")
                     continue
 
-                final_patches.append(patch)
+                if "New Effect:" in ability_desc:
+                    ability_desc = re.sub(r'^.*?(New Effect:)', r'\1', ability_desc)
 
-        logging.debug(f"Final patch count after all filtering: {len(final_patches)}")
+                ability_desc = ability_desc.replace("New Effect:", "\nNew Effect:")
+                ability_desc = ability_desc.replace("Now triggers", "\nNow triggers")
 
-        def version_key(patch):
-            version_str = patch['version'].lower().replace('v', '')
-            if ' - ' in version_str:
-                version_str = version_str.split(' - ')[0]
+                changes.append(f"{ability_name}: {ability_desc}")
+            else:
+                changes.append(text)
+
+        if changes:
+            # patch_dates is keyed by canonical version, so one lookup covers every spelling;
+            # dates written in the version heading are the fallback
+            wiki_date = patch_dates.get(patch_version(version).key)
+
+            note = {
+                'version': version,
+                'date': wiki_date if wiki_date else extract_date(version),
+                'changes': changes
+            }
+            patch_notes.append(note)
+            if audit is not None:
+                audit.append((version, change_texts, note, None))
+        else:
+            _record_skip(audit, version, change_texts, 'duplicate_changes')
+
+    return patch_notes
+
+def _run_patch_pipeline(history, patch_dates, include_undocumented, exclude_art_sustainability,
+                        exclude_alpha_v1, audit=None):
+    # Returns the sorted patches and filter_patches' per-stage report
+    patch_notes = _extract_patch_notes(history, patch_dates, exclude_art_sustainability, audit=audit)
+    logging.debug(f"Initially extracted {len(patch_notes)} patches")
+
+    final_patches, report = filter_patches(patch_notes, include_undocumented=include_undocumented,
+                                           exclude_alpha_v1=exclude_alpha_v1)
+    logging.debug(f"Final patch count after all filtering: {len(final_patches)}")
+
+    final_patches = tuple(sorted(final_patches, key=lambda patch: patch_version(patch['version']).sort_key, reverse=True))
+    return final_patches, report
+
+def _build_patch_data(cache_key):
+    champion_name, include_undocumented, exclude_art_sustainability, exclude_alpha_v1 = cache_key
+    try:
+        # Get patch dates from wiki pages
+        patch_dates = get_patch_dates()
+        logging.debug(f"Loaded {len(patch_dates)} patch dates from wiki pages")
 
-            try:
-                parts = [int(part) for part in version_str.split('.')]
-                while len(parts) < 3:
-                    parts.append(0)
-                return parts
-            except (ValueError, AttributeError):
-                return [0, 0, 0]
+        history = get_patch_history(champion_name)
+        if history is None:
+            return ()
 
-        return sorted(final_patches, key=version_key, reverse=True)
+        final_patches, _ = _run_patch_pipeline(history, patch_dates, include_undocumented,
+                                               exclude_art_sustainability, exclude_alpha_v1)
+        _patch_results.put(cache_key, final_patches)
+        return final_patches
 
     except Exception as e:
         logging.error(f"Error processing patch data for {champion_name}: {e}")
-        return []
-
+        return ()
+
+# Exclusion categories shown by /debug, keyed by the filter stage that dropped the patch
+_STAGE_EXCLUSIONS = {
+    'game mode': 'game_mode_only',
+    'undocumented': 'other',
+    'alpha/v1': 'alpha_v0_v1_month_patches',
+    'cosmetic': 'other',
+}
+
+def _numeric_exclusion(change_texts):
+    # The numeric stage drops anything without numbers; name the kind of change it was
+    if is_bug_fix_only(change_texts):
+        return 'bug_fix_only'
+    if is_animation_update(change_texts):
+        return 'animation_only'
+    if is_model_texture_update(change_texts):
+        return 'model_texture_only'
+    return 'no_numerical_values'
+
+def audit_patch_data(champion_name, include_undocumented=True, exclude_art_sustainability=False, exclude_alpha_v1=True):
+    # Every patch on the page with changes, tagged 'included' or with the reason it was excluded,
+    # from the same cached history and the same single pipeline pass get_patch_data uses
+    history = get_patch_history(champion_name)
+    if history is None:
+        return None
+    patch_dates = get_patch_dates()
+
+    audit = []
+    final_patches, report = _run_patch_pipeline(history, patch_dates, include_undocumented,
+                                                exclude_art_sustainability, exclude_alpha_v1, audit=audit)
+    excluded = {id(patch): stage['stage'] for stage in report for patch in stage['excluded']}
+    cache_key = (champion_name, include_undocumented, exclude_art_sustainability, exclude_alpha_v1)
+    _patch_results.put(cache_key, final_patches)
+
+    entries = []
+    for version, change_texts, note, reason in audit:
+        changes = [text for text in change_texts if text]
+        if note is not None:
+            stage = excluded.get(id(note))
+            if stage is None:
+                reason = 'included'
+            elif stage == 'numeric':
+                reason = _numeric_exclusion(changes)
+            else:
+                reason = _STAGE_EXCLUSIONS[stage]
+            date = note['date']
+        else:
+            date = extract_date(version)
+
+        entries.append({
+            'patch': {
+                'version': version,
+                'date': date if date is not None else "",
+                'changes': changes,
+            },
+            'included': reason == 'included',
+            'category': reason,
+        })
+
+    entries.sort(key=lambda entry: patch_version(entry['patch']['version']).sort_key, reverse=True)
+    return final_patches, entries
+
+@functools.lru_cache(maxsize=16384)
 def extract_date(version_text):
     try:
         date_match = re.search(r'\((.*?)\)|Released: (.*)', version_text)
@@ -500,54 +673,217 @@ game_mode_keywords = [
     'odyssey', 'star guardian', 'project', 'rgm', 'rgms'
 ]
 
+undocumented_keywords = [
+    'undocumented', 'unlisted', 'not documented', 'not listed',
+    'no patch notes', 'unreleased'
+]
+
+hud_keywords = [
+    'hud', 'interface', 'user interface', 'ui', 'icon', 'icons',
+    'ability icon', 'visual update', 'visual effect', 'visual display',
+    'ability art', 'portrait', 'minimap icon'
+]
+
+tooltip_keywords = [
+    'tooltip', 'description', 'text', 'wording', 'description text',
+    'ability description', 'tooltip text', 'description updated',
+    'tooltip updated', 'text updated', 'wording updated'
+]
+
+item_keywords = [
+    'recommended', 'item', 'items', 'recommended items',
+    'item build', 'recommended build', 'item recommendation',
+    'item set', 'item loadout'
+]
+
+splash_keywords = [
+    'splash', 'artwork', 'splash art', 'splash artwork', 'art',
+    'artwork updated', 'updated artwork', 'updated splash',
+    'visual update', 'splash screen', 'portrait', 'champion portrait',
+    'splash image', 'loading screen'
+]
+
+_change_classifier = ChangeClassifier({
+    BUG_FIX: bug_fix_keywords,
+    UNDOCUMENTED: undocumented_keywords,
+    GAME_MODE: game_mode_keywords,
+    ANIMATION_WORD: animation_keywords,
+    MODEL_TEXTURE_WORD: model_texture_keywords,
+    _HUD_WORD: hud_keywords,
+    _HUD_HINT: ['icon', 'hud', 'ui'],
+    _TOOLTIP_WORD: tooltip_keywords,
+    _TOOLTIP_HINT: ['tooltip', 'text', 'description'],
+    _ITEM_WORD: item_keywords,
+    _ITEM_HINT: ['recommend', 'item'],
+    _SPLASH_WORD: splash_keywords,
+    _SPLASH_HINT: ['splash', 'art', 'portrait', 'loading screen'],
+    _ANIMATION_HINT: ['animation', 'visual', 'effect', 'vfx', 'particle'],
+    _MODEL_TEXTURE_HINT: ['model', 'texture', 'visual'],
+    _NUMERIC_STAT_WORD: ['damage', 'health', 'mana', 'cooldown', 'range', 'speed', 'armor', 'resist'],
+    _STAT_VERB: ['increased', 'decreased', 'reduced'],
+    _STAT_NOUN: ['bonus', 'cooldown', 'damage', 'mana'],
+    _ADDED: ['added'],
+    _ADDED_TO_GAME: ['added to the game'],
+})
+
+_COMPOSITE_CATEGORIES = (
+    (ICON_HUD, _HUD_WORD, _HUD_HINT),
+    (TOOLTIP, _TOOLTIP_WORD, _TOOLTIP_HINT),
+    (RECOMMENDED_ITEMS, _ITEM_WORD, _ITEM_HINT),
+    (SPLASH_ARTWORK, _SPLASH_WORD, _SPLASH_HINT),
+    (ANIMATION, ANIMATION_WORD, _ANIMATION_HINT),
+    (MODEL_TEXTURE, MODEL_TEXTURE_WORD, _MODEL_TEXTURE_HINT),
+)
+
+SEASON_URLS = [
+    "https://wiki.leagueoflegends.com/en-us/Patch/2025_Annual_Cycle",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2024",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2023",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2022",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2021",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2020",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2019",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2018",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2017",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2016",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2015",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_2014",
+    "https://wiki.leagueoflegends.com/en-us/Patch/Season_Three"
+]
+
+# Only the current cycle still gets new patches; every older season is frozen
+CURRENT_SEASON_URL = SEASON_URLS[0]
+CURRENT_SEASON_TTL = int(os.environ.get('PATCH_DATES_TTL', 6 * 3600))
+PATCH_DATES_CACHE_FILE = 'patch_dates.json'
+
+_season_store = None
+_patch_date_map = None
+_patch_dates_version = None
+_season_lock = threading.Lock()
+
+def fetch_season_dates(url):
+    try:
+        logging.debug(f"Fetching patch dates from: {url}")
+        page = fetcher.fetch_parsed(url, parse_season_dates, timeout=10)
+        if page.status_code != 200:
+            logging.error(f"Failed to fetch patch dates, status code: {page.status_code}")
+            return None
+
+        return page.value
+    except Exception as e:
+        logging.error(f"Error fetching patch dates from {url}: {e}")
+        return None
+
+def parse_season_dates(content):
+    season_dates = {}
+    soup = wiki_html.parse(content, wiki_html.SEASON_TABLES)
+    tables = soup.find_all('table', {'class': ['sortable', 'article-table']})
+
+    for table in tables:
+        rows = table.find_all('tr')
+        for row in rows[1:]:  # Skip header row
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                version_text = cells[0].get_text(strip=True)
+                patch_date = cells[1].get_text(strip=True)
+
+                # Versions are kept as written; the merged map is keyed by canonical version
+                if version_text and patch_date:
+                    season_dates[version_text] = patch_date
+
+    return season_dates
+
+def _season_is_fresh(url, entry, now):
+    if entry is None:
+        return False
+    if url != CURRENT_SEASON_URL:
+        return True
+    return now - entry.get('fetched_at', 0) <= CURRENT_SEASON_TTL
+
+def refresh_patch_dates(refetch_current=False):
+    return flights.do('patch_dates', _refresh_patch_dates, refetch_current)
+
+def _refresh_patch_dates(refetch_current):
+    global _season_store, _patch_date_map
+
+    with _season_lock:
+        if _season_store is None:
+            _season_store = disk_cache.load_json(PATCH_DATES_CACHE_FILE, default={})
+            if not isinstance(_season_store, dict):
+                _season_store = {}
+            logging.debug(f"Loaded {len(_season_store)} cached season tables from disk")
+
+        now = time.time()
+        changed = False
+
+        stale_urls = [url for url in SEASON_URLS
+                      if (refetch_current and url == CURRENT_SEASON_URL)
+                      or not _season_is_fresh(url, _season_store.get(url), now)]
+        fetched = fetcher.map_urls(fetch_season_dates, stale_urls)
+        failed = 0
+
+        for url, season_dates in zip(stale_urls, fetched):
+            if season_dates:
+                _season_store[url] = {'fetched_at': now, 'dates': season_dates}
+                changed = True
+            else:
+                failed += 1
+                if url in _season_store:
+                    logging.debug(f"Keeping stale patch dates for {url}")
+
+        if changed:
+            disk_cache.save_json(PATCH_DATES_CACHE_FILE, _season_store)
+
+        if changed or _patch_date_map is None:
+            # Merge in the original fetch order so later seasons win on duplicate versions
+            patch_date_map = {}
+            for url in SEASON_URLS:
+                entry = _season_store.get(url)
+                if entry:
+                    patch_date_map.update(index_by_version(entry.get('dates', {})))
+            _patch_date_map = patch_date_map
+            snapshot_store.publish('patch_dates', patch_date_map)
+
+        return failed == 0
 
 def get_patch_dates():
-    patch_date_map = {}
-    urls = [
-        "https://wiki.leagueoflegends.com/en-us/Patch/2025_Annual_Cycle",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2024",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2023",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2022",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2021",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2020",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2019",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2018",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2017",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2016",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2015",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_2014",
-        "https://wiki.leagueoflegends.com/en-us/Patch/Season_Three"
-    ]
-    
-    for url in urls:
-        try:
-            logging.debug(f"Fetching patch dates from: {url}")
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                logging.error(f"Failed to fetch patch dates, status code: {response.status_code}")
-                continue
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            tables = soup.find_all('table', {'class': ['sortable', 'article-table']})
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows[1:]:  # Skip header row
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        patch_version = cells[0].get_text(strip=True)
-                        patch_date = cells[1].get_text(strip=True)
-                        
-                        # Clean up version number
-                        patch_version = patch_version.replace('V', 'v').replace('v ', 'v')
-                        if patch_version.startswith('Version '):
-                            patch_version = 'v' + patch_version[8:]
-                        
-                        # Store in mapping
-                        if patch_version and patch_date:
-                            patch_date_map[patch_version] = patch_date
-                            logging.debug(f"Found date for patch {patch_version}: {patch_date}")
-        except Exception as e:
-            logging.error(f"Error fetching patch dates from {url}: {e}")
-    
+    global _patch_date_map, _patch_dates_version
+
+    shared = snapshot_store.latest('patch_dates')
+    if shared is not None:
+        if shared.version != _patch_dates_version:
+            _patch_date_map = shared.value
+            _patch_dates_version = shared.version
+        # Staleness is the writer's concern once a shared map exists
+        return _patch_date_map
+
+    patch_date_map = _patch_date_map
+    if patch_date_map is None:
+        refresh_patch_dates()
+        return _patch_date_map
+
+    # Serve the last good map and let the refresher fetch any season that went stale
+    now = time.time()
+    store = _season_store
+    if any(not _season_is_fresh(url, store.get(url), now) for url in SEASON_URLS):
+        refresher.trigger('patch_dates')
     return patch_date_map
+
+def reset_caches():
+    # Drops every in-memory cache, so the next read starts cold; the dates file on disk is kept
+    global _season_store, _patch_date_map, _patch_dates_version
+    champion_registry.reset()
+    _patch_histories.clear()
+    _patch_results.clear()
+    with _season_lock:
+        _season_store = None
+        _patch_date_map = None
+        _patch_dates_version = None
+    classify_change.cache_clear()
+    extract_date.cache_clear()
+
+refresher.register('champions', champion_registry.refresh, CHAMPIONS_TTL)
+refresher.register('patch_dates', functools.partial(refresh_patch_dates, refetch_current=True), CURRENT_SEASON_TTL)
+for _champion in HOT_CHAMPIONS:
+    refresher.register(f'patch_history:{_champion}', functools.partial(refresh_patch_history, _champion),
+                       PATCH_HISTORY_TTL)
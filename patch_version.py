@@ -0,0 +1,43 @@
+import functools
+
+
+class PatchVersion:
+    __slots__ = ('text', 'key', 'sort_key')
+
+    def __init__(self, text):
+        self.text = text
+        # "V14.1 - Hotfix", "v14.1", "Version 14.1" and "14.1" all share the key "14.1"
+        clean = text.split(' - ')[0].strip().lower()
+        if clean.startswith('version '):
+            clean = clean[8:]
+        self.key = clean.lstrip('v').strip()
+        self.sort_key = _sort_key(text)
+
+    def __repr__(self):
+        return f"PatchVersion({self.text!r})"
+
+
+def _sort_key(text):
+    # Numeric components padded to three; anything unparseable sorts as 0.0.0
+    version_str = text.lower().replace('v', '')
+    if ' - ' in version_str:
+        version_str = version_str.split(' - ')[0]
+
+    try:
+        parts = [int(part) for part in version_str.split('.')]
+    except ValueError:
+        return (0, 0, 0)
+    while len(parts) < 3:
+        parts.append(0)
+    return tuple(parts)
+
+
+@functools.lru_cache(maxsize=16384)
+def patch_version(text):
+    # Interned: every caller asking about the same version text shares one parsed value
+    return PatchVersion(text)
+
+
+def index_by_version(version_dates):
+    # {version text: date} -> {canonical key: date}; later entries win on duplicate keys
+    return {patch_version(version).key: date for version, date in version_dates.items()}
@@ -0,0 +1,210 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+import snapshot_store
+
+# Datasets are refreshed once this fraction of their TTL has passed, so readers never see them expire
+REFRESH_AHEAD = float(os.environ.get('REFRESH_AHEAD', 0.8))
+REFRESH_RETRY = int(os.environ.get('REFRESH_RETRY', 60))
+# Datasets due together are refreshed in parallel, up to this many at once
+REFRESH_WORKERS = int(os.environ.get('REFRESH_WORKERS', 4))
+
+
+class Dataset:
+    __slots__ = ('name', 'refresh', 'interval', 'next_due', 'running', 'refreshes', 'failures',
+                 'consecutive_failures', 'last_refresh', 'last_success', 'last_duration', 'last_error')
+
+    def __init__(self, name, refresh, interval):
+        self.name = name
+        self.refresh = refresh
+        self.interval = interval
+        # Due immediately, which is what makes the first pass a warm-up
+        self.next_due = 0.0
+        self.running = False
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_refresh = None
+        self.last_success = None
+        self.last_duration = None
+        self.last_error = None
+
+
+def _timestamp(seconds):
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds).isoformat(timespec='seconds')
+
+
+class RefreshScheduler:
+    def __init__(self, ahead=REFRESH_AHEAD, retry=REFRESH_RETRY, clock=time.monotonic):
+        self.ahead = ahead
+        self.retry = retry
+        self._clock = clock
+        self._datasets = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.warmed = threading.Event()
+
+    def register(self, name, refresh, ttl):
+        # refresh() swaps in a new snapshot and returns a truthy value on success; on failure
+        # the previous snapshot stays in place and the dataset is retried after `retry` seconds
+        with self._cond:
+            self._datasets[name] = Dataset(name, refresh, max(ttl * self.ahead, 1))
+            self._cond.notify()
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return False
+            self._stopping = False
+            self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+            self._thread.start()
+        logging.info(f"Background refresh started for {len(self._datasets)} datasets")
+        return True
+
+    def stop(self, timeout=None):
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def trigger(self, name):
+        # Called by readers holding a stale snapshot: they keep serving it while this refreshes.
+        # Processes reading shared snapshots leave refreshing to the writer.
+        if not snapshot_store.is_writer():
+            return
+        with self._cond:
+            dataset = self._datasets.get(name)
+            if dataset is None or dataset.running:
+                return
+            now = self._clock()
+            if dataset.consecutive_failures and now < dataset.next_due:
+                return
+            dataset.next_due = now
+            if self._thread is not None:
+                self._cond.notify()
+                return
+            dataset.running = True
+
+        threading.Thread(target=self._run, args=(dataset,), name=f'{name}-refresh', daemon=True).start()
+
+    def refresh_now(self, name):
+        with self._cond:
+            dataset = self._datasets[name]
+            if dataset.running:
+                return False
+            dataset.running = True
+        return self._run(dataset)
+
+    def _loop(self):
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='refresh') as executor:
+            while True:
+                with self._cond:
+                    due = []
+                    while not self._stopping:
+                        now = self._clock()
+                        idle = [dataset for dataset in self._datasets.values() if not dataset.running]
+                        due = [dataset for dataset in idle if dataset.next_due <= now]
+                        if due:
+                            break
+                        self._cond.wait(min((dataset.next_due - now for dataset in idle), default=None))
+                    if self._stopping:
+                        return
+                    for dataset in due:
+                        dataset.running = True
+
+                futures = {executor.submit(self._run, dataset): dataset for dataset in due}
+                wait(futures)
+                for future, dataset in futures.items():
+                    if future.exception() is not None:
+                        self._run_failed(dataset, future.exception())
+                self.warmed.set()
+
+    def _run_failed(self, dataset, error):
+        # _run records its own refresh failures; this catches anything that escaped it, so the
+        # dataset is not left marked running forever
+        logging.error(f"Error running refresh of {dataset.name}: {error}")
+        with self._cond:
+            dataset.running = False
+            dataset.failures += 1
+            dataset.consecutive_failures += 1
+            dataset.last_error = str(error)
+            dataset.next_due = self._clock() + min(dataset.interval, self.retry)
+            self._cond.notify()
+
+    def _run(self, dataset):
+        started = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            ok = bool(dataset.refresh())
+            if not ok:
+                error = "refresh returned no data"
+        except Exception as e:
+            ok = False
+            error = str(e)
+            logging.error(f"Error refreshing {dataset.name}: {e}")
+        duration = time.perf_counter() - start
+
+        with self._cond:
+            dataset.running = False
+            dataset.refreshes += 1
+            dataset.last_refresh = started
+            dataset.last_duration = duration
+            if ok:
+                dataset.consecutive_failures = 0
+                dataset.last_success = started
+                dataset.next_due = self._clock() + dataset.interval
+            else:
+                dataset.failures += 1
+                dataset.consecutive_failures += 1
+                dataset.last_error = error
+                dataset.next_due = self._clock() + min(dataset.interval, self.retry)
+            self._cond.notify()
+
+        logging.debug(f"Refreshed {dataset.name} in {duration:.2f}s ({'ok' if ok else 'failed'})")
+        return ok
+
+    def status(self):
+        with self._cond:
+            now = self._clock()
+            return {
+                'running': self._thread is not None,
+                'warmed': self.warmed.is_set(),
+                'datasets': {
+                    name: {
+                        'last_refresh': _timestamp(dataset.last_refresh),
+                        'last_success': _timestamp(dataset.last_success),
+                        'duration': None if dataset.last_duration is None else round(dataset.last_duration, 3),
+                        'refreshes': dataset.refreshes,
+                        'failures': dataset.failures,
+                        'consecutive_failures': dataset.consecutive_failures,
+                        'last_error': dataset.last_error,
+                        'refreshing': dataset.running,
+                        'next_refresh_in': round(max(dataset.next_due - now, 0), 1),
+                    }
+                    for name, dataset in self._datasets.items()
+                },
+            }
+
+
+scheduler = RefreshScheduler()
+
+def register(name, refresh, ttl):
+    scheduler.register(name, refresh, ttl)
+
+def trigger(name):
+    scheduler.trigger(name)
+
+def status():
+    return scheduler.status()
@@ -0,0 +1,60 @@
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, func, *args, **kwargs):
+        # The first caller for a key runs func; callers arriving while it runs wait and get the
+        # same result, or the same exception. Nothing is kept once the call finishes, and func
+        # must not re-enter do() with its own key.
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._calls)
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._calls), 'leaders': self.leaders, 'shared': self.shared}
+
+
+# One process-wide group for every wiki-backed loader; keys are namespaced by dataset
+flights = SingleFlight()
@@ -0,0 +1,71 @@
+from aho_corasick import AhoCorasick
+
+CHAMPION_CELL = 'champion_cell'
+NAME = 'name'
+PARTIAL_NAME = 'partial_name'
+NICKNAME = 'nickname'
+SPECIAL_CASE = 'special_case'
+
+_NAME = 0
+_SPECIAL = 1
+
+
+class SkinAttributor:
+    def __init__(self, snapshot, nicknames, partial_names, special_cases):
+        # Built once per champion-list snapshot; every rule table is resolved up front
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self.name_set = snapshot.name_set
+        self.nicknames = dict(nicknames)
+
+        # One pass over the raw skin name finds champion names and special-case names together.
+        # Ranks reproduce the old scans: longest champion first (alphabetical among equals), and
+        # the first special case or partial name in table order, skipping "Various" entries.
+        raw_automaton = AhoCorasick()
+        self._names = snapshot.longest_first
+        for rank, champion in enumerate(self._names):
+            raw_automaton.add(champion, (_NAME, rank))
+
+        self._specials = tuple((special, champion) for special, champion in special_cases.items()
+                               if champion != "Various")
+        for rank, (special, _) in enumerate(self._specials):
+            raw_automaton.add(special, (_SPECIAL, rank))
+
+        lower_automaton = AhoCorasick()
+        self._partials = tuple((partial, champion) for partial, champion in partial_names.items()
+                               if champion != "Various")
+        for rank, (partial, _) in enumerate(self._partials):
+            lower_automaton.add(partial, rank)
+
+        self._raw = raw_automaton.build()
+        self._lower = lower_automaton.build()
+
+    def attribute(self, skin_name, champion_cell=None):
+        # (champion, rule) for the first rule that matches, or (None, None)
+        if champion_cell in self.name_set:
+            return champion_cell, CHAMPION_CELL
+
+        best_name = best_special = None
+        for _, _, (kind, rank) in self._raw.iter(skin_name):
+            if kind == _NAME:
+                if best_name is None or rank < best_name:
+                    best_name = rank
+            elif best_special is None or rank < best_special:
+                best_special = rank
+
+        if best_name is not None:
+            return self._names[best_name], NAME
+
+        best_partial = min(self._lower.values(skin_name.lower()), default=None)
+        if best_partial is not None:
+            return self._partials[best_partial][1], PARTIAL_NAME
+
+        for part in skin_name.split():
+            champion = self.nicknames.get(part)
+            if champion is not None:
+                return champion, NICKNAME
+
+        if best_special is not None:
+            return self._specials[best_special][1], SPECIAL_CASE
+
+        return None, None
@@ -1,12 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
+import functools
 import logging
-from patch_data import get_champions_list
+from patch_data import champion_registry
+import fetcher
+import mapping_journal
+import refresher
+import snapshot_store
+import wiki_html
+from champion_matcher import ChampionMatcher
+from skin_attributor import CHAMPION_CELL, SkinAttributor
+from single_flight import flights
+import os
 import re
 from datetime import datetime
+import threading
+from types import MappingProxyType
 
 logging.basicConfig(level=logging.DEBUG)
 
+@functools.lru_cache(maxsize=16384)
 def parse_date(date_str):
     try:
         if not date_str or not isinstance(date_str, str):
@@ -34,6 +45,10 @@ def parse_date(date_str):
 
         date_str = re.sub(r'\(.*?\)', '', date_str).strip()
 
+        # Every format below needs a four-digit %Y; skip eight failing strptime calls otherwise
+        if not _FOUR_DIGITS_RE.search(date_str):
+            return f"Non-standard: {date_str}"
+
         formats = [
             '%B %d, %Y',
             '%B %d,%Y',
@@ -57,391 +72,698 @@ def parse_date(date_str):
         logging.error(f"Error parsing date {date_str}: {e}")
         return "Unknown"
 
-_skins_cache = None
-_cache_timestamp = None
+_FOUR_DIGITS_RE = re.compile(r'\d{4}')
+_WIKI_DATE_SEARCH_RE = re.compile(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})')
+_YEAR_RE = re.compile(r'\b(20\d\d|19\d\d)\b')
+_MONTH_NAME_RE = re.compile(r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b', re.IGNORECASE)
+_DAY_RE = re.compile(r'\b(\d{1,2})(st|nd|rd|th)?\b')
 
-def get_all_skins_data():
-    global _skins_cache, _cache_timestamp
-
-    special_cases = {
-        "Captain Fortune": "Miss Fortune",
-        "Gun Goddess Miss Fortune": "Miss Fortune",
-        "Pajama Guardian": "Various",
-        "Little Demon": "Tristana",
-        "Hextech": "Various",
-        "Emumu": "Amumu",
-        "Surprise Party": "Fiddlesticks",
-        "Definitely Not": "Blitzcrank",
-        "Traditional": "Various",
-        "Championship": "Various",
-        "Victorious": "Various",
-        "Conqueror": "Various"
-    }
+_WIKI_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+_MONTHS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+}
 
-    current_time = datetime.now()
-    if _skins_cache is not None and _cache_timestamp is not None:
-        if (current_time - _cache_timestamp).total_seconds() <= 3600:
-            logging.debug("Using cached skins data")
-            return _skins_cache
+UNKNOWN_ORDINAL = datetime.min.toordinal()
+# Custom-mapped skins without a wiki-style date sort as if released at the start of 2023
+CUSTOM_DEFAULT_ORDINAL = datetime(2023, 1, 1).toordinal()
+
+@functools.lru_cache(maxsize=16384)
+def _date_ordinal(date):
+    # (day ordinal or None for an impossible wiki date, whether the date is in d-Mon-yyyy form)
+    if date == "Unknown":
+        return UNKNOWN_ORDINAL, False
+
+    match = _WIKI_DATE_SEARCH_RE.search(date)
+    if match:
+        day, month, year = match.groups()
+        try:
+            return datetime(int(year), _WIKI_MONTHS.get(month, 1), int(day)).toordinal(), True
+        except ValueError:
+            return None, True
+
+    year_match = _YEAR_RE.search(date)
+    if year_match:
+        try:
+            year = int(year_match.group(1))
+
+            month = 1
+            month_match = _MONTH_NAME_RE.search(date)
+            if month_match:
+                month = _MONTHS.get(month_match.group(1).lower(), 1)
+
+            day = 1
+            day_match = _DAY_RE.search(date)
+            if day_match:
+                day = int(day_match.group(1))
+
+            return datetime(year, month, day).toordinal(), False
+        except (ValueError, OverflowError):
+            logging.warning(f"Couldn't create date object from: {date}")
+            return UNKNOWN_ORDINAL, False
+
+    return UNKNOWN_ORDINAL, False
+
+def release_ordinal(release_date):
+    return _date_ordinal(release_date)[0]
+
+def _custom_sort_ordinal(skin):
+    ordinal, wiki_format = _date_ordinal(skin['release_date'])
+    return ordinal if wiki_format else CUSTOM_DEFAULT_ORDINAL
+
+def sort_champion_skins(champion_skins, custom_mappings):
+    # Newest first by the ordinal stored at ingest; equal dates keep their table order.
+    # custom_mappings is a private copy: the live dict changes under _view_lock mid-rebuild.
+    custom_champions = set(custom_mappings.values())
+    for champion, skins in champion_skins.items():
+        if champion in custom_champions:
+            keys = [_custom_sort_ordinal(skin) if skin['name'] in custom_mappings else skin['release_ordinal']
+                    for skin in skins]
+        else:
+            keys = [skin['release_ordinal'] for skin in skins]
+
+        if None in keys:
+            logging.error(f"Error sorting skins for {champion}: invalid release date")
+            continue
+
+        order = sorted(range(len(skins)), key=keys.__getitem__, reverse=True)
+        skins[:] = [skins[i] for i in order]
+
+SPECIAL_CASES = {
+    "Captain Fortune": "Miss Fortune",
+    "Gun Goddess Miss Fortune": "Miss Fortune",
+    "Pajama Guardian": "Various",
+    "Little Demon": "Tristana",
+    "Hextech": "Various",
+    "Emumu": "Amumu",
+    "Surprise Party": "Fiddlesticks",
+    "Definitely Not": "Blitzcrank",
+    "Traditional": "Various",
+    "Championship": "Various",
+    "Victorious": "Various",
+    "Conqueror": "Various"
+}
 
-    try:
-        champions = get_champions_list()
-        champion_skins = {champion: [] for champion in champions}
+SPECIAL_SKIN_CHAMPIONS = {
+    "Hextech": ["Alistar", "Amumu", "Annie", "Cho'Gath", "Galio", "Janna", "Kog'Maw", "Malzahar", "Nocturne", "Poppy", "Rammus", "Renekton", "Sejuani", "Singed", "Sion", "Swain", "Tristana", "Ziggs", "Jarvan IV", "Ezreal"],
+    "Championship": ["Ashe", "Kalista", "Kha'Zix", "LeBlanc", "Riven", "Shyvana", "Thresh", "Zed", "Zoe"],
+    "Victorious": ["Aatrox", "Blitzcrank", "Elise", "Graves", "Janna", "Jarvan IV", "Lucian", "Maokai", "Morgana", "Orianna", "Sivir"],
+    "Conqueror": ["Alistar", "Jax", "Karma", "Nautilus", "Varus"],
+    "Traditional": ["Lee Sin", "Karma", "Sejuani", "Trundle"]
+}
 
-        url = "https://wiki.leagueoflegends.com/en-us/List_of_champion_skins"
-        logging.debug(f"Fetching all skins data from: {url}")
+_WIKI_DATE_RE = re.compile(r'\d{1,2}-[A-Za-z]{3}-\d{4}')
+
+def _is_placeholder_date(date_text):
+    return all(c in "✔⭐⭘‒" for c in date_text)
+
+class SkinRow:
+    __slots__ = ('name', 'date_text', 'linked_date', 'attr_date', 'champion_cell')
+
+    def __init__(self, name, date_text, linked_date, attr_date, champion_cell):
+        self.name = name
+        self.date_text = date_text
+        self.linked_date = linked_date
+        self.attr_date = attr_date
+        self.champion_cell = champion_cell
+
+    def release_date(self):
+        if self.linked_date:
+            return self.linked_date
+
+        date_text = self.date_text
+        if date_text and date_text.lower() != 'unknown' and not _is_placeholder_date(date_text):
+            date_text = re.sub(r'\([^)]*\)', '', date_text).strip()
+            if date_text:
+                return date_text
+
+        return self.attr_date or "Unknown"
+
+def _find_attr_date(release_cell):
+    for element in release_cell.select('[title], [data-sort-value]'):
+        if 'title' in element.attrs and re.search(r'\d{4}', element['title']):
+            return element['title']
+        elif 'data-sort-value' in element.attrs and re.search(r'\d{4}', element['data-sort-value']):
+            return element['data-sort-value']
+    return None
+
+def _find_column_indexes(header_cells):
+    name_idx = None
+    release_idx = None
+    avail_idx = None
+
+    for idx, cell in enumerate(header_cells):
+        img_element = cell.find('img')
+        if img_element and 'src' in img_element.attrs:
+            img_src = img_element['src']
+            logging.debug(f"Found image in header cell {idx}: {img_src}")
+
+            if 'Release.png' in img_src:
+                release_idx = idx
+                logging.debug(f"Found Release column at index {idx}")
 
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            logging.error(f"Failed to fetch skins data, status code: {response.status_code}")
-            return {}
+            elif 'Availability.png' in img_src:
+                avail_idx = idx
+                logging.debug(f"Found Availability column at index {idx}")
+
+        cell_text = cell.get_text(strip=True).lower()
+        logging.debug(f"Header cell {idx}: '{cell_text}'")
+        if 'skin' in cell_text or 'name' in cell_text:
+            name_idx = idx
+        elif 'release' in cell_text and release_idx is None:
+            release_idx = idx
+        elif 'availab' in cell_text and avail_idx is None:
+            avail_idx = idx
+
+    if name_idx is None:
+        name_idx = 1
+    if release_idx is None:
+        release_idx = 2
+    if avail_idx is None and release_idx == 2:
+        avail_idx = 3
+
+    return name_idx, release_idx
+
+def parse_skins_table(content):
+    soup = wiki_html.parse(content, wiki_html.SKINS_TABLE)
+    logging.debug("Successfully fetched HTML content for all skins")
+
+    table = soup.find('table', {'class': ['sortable', 'article-table', 'nopadding']})
+    if not table:
+        logging.error("Could not find the skins table")
+        return None
+
+    rows = table.find_all('tr')
+    if not rows:
+        logging.error("The skins table has no rows")
+        return None
+
+    name_idx, release_idx = _find_column_indexes(rows[0].find_all(['th']))
+    logging.debug(f"Using column {name_idx} for skin names and column {release_idx} for release dates")
+
+    skin_rows = []
+    min_cells = max(name_idx, release_idx)
+
+    # Every cell is read exactly once here; later stages only touch SkinRow records
+    for row in rows[1:]:
+        cells = row.find_all(['td', 'th'])
+        if len(cells) <= min_cells:
+            continue
+
+        release_cell = cells[release_idx]
+        linked_date = None
+        for link in release_cell.find_all('a'):
+            link_text = link.get_text(strip=True)
+            if _WIKI_DATE_RE.match(link_text):
+                linked_date = link_text
+                break
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        logging.debug("Successfully fetched HTML content for all skins")
+        skin_row = SkinRow(
+            name=cells[name_idx].get_text(strip=True),
+            date_text=release_cell.get_text(strip=True),
+            linked_date=linked_date,
+            attr_date=None,
+            champion_cell=cells[0].get_text(strip=True)
+        )
+        if linked_date is None and skin_row.release_date() == "Unknown":
+            skin_row.attr_date = _find_attr_date(release_cell)
+
+        skin_rows.append(skin_row)
+
+    soup.decompose()
+    return skin_rows
+
+SKIN_NICKNAMES = {
+    "Emumu": "Amumu",
+    "MF": "Miss Fortune",
+    "TF": "Twisted Fate",
+    "ASol": "Aurelion Sol",
+    "Cass": "Cassiopeia",
+    "Mundo": "Dr. Mundo",
+    "Fiddle": "Fiddlesticks",
+    "GP": "Gangplank",
+    "J4": "Jarvan IV",
+    "Kai": "Kai'Sa",
+    "Kass": "Kassadin",
+    "Kat": "Katarina",
+    "Malph": "Malphite",
+    "Yi": "Master Yi",
+    "Morde": "Mordekaiser",
+    "Nunu": "Nunu & Willump",
+    "Raka": "Soraka",
+    "Tahm": "Tahm Kench",
+    "Vlad": "Vladimir",
+    "Xin": "Xin Zhao"
+}
 
-        table = soup.find('table', {'class': ['sortable', 'article-table', 'nopadding']})
-        if not table:
-            logging.error("Could not find the skins table")
-            return {}
+PARTIAL_NAME_MAPPINGS = {
+    "urf": "Warwick",
+    "urfwick": "Warwick",
+    "alien": "Heimerdinger",
+    "definitely not": "Blitzcrank",
+    "festive": "Maokai",
+    "beemo": "Teemo",
+    "pug'maw": "Kog'Maw",
+    "baron": "Nashor",
+    "poro": "Braum",
+    "arcade": "Various",
+    "project": "Various",
+    "cosmic": "Various",
+    "dark star": "Various",
+    "pool party": "Various",
+    "guardian": "Various"
+}
 
-        rows = table.find_all('tr')
+_attributor = None
+_attributor_lock = threading.Lock()
+
+def get_skin_attributor(registry):
+    # Rebuilt only when build_skins_data is handed a different champion snapshot
+    global _attributor
+    attributor = _attributor
+    if attributor is None or attributor.snapshot is not registry:
+        with _attributor_lock:
+            if _attributor is None or _attributor.snapshot is not registry:
+                _attributor = SkinAttributor(registry, SKIN_NICKNAMES, PARTIAL_NAME_MAPPINGS, SPECIAL_CASES)
+                logging.debug(f"Built skin attributor for registry version {registry.version}")
+            attributor = _attributor
+    return attributor
+
+def _attribute_skin(skin_row, registry):
+    skin_champion, rule = get_skin_attributor(registry).attribute(skin_row.name, skin_row.champion_cell)
+    if rule is not None and rule != CHAMPION_CELL:
+        logging.debug(f"Matched skin {skin_row.name} to champion {skin_champion} by {rule}")
+    return skin_champion
+
+def _index_special_rows(skin_rows):
+    # Special-case name -> rows that contain it and carry a usable date, in table order
+    index = {special_skin: [] for special_skin in SPECIAL_CASES}
+    for skin_row in skin_rows:
+        date_text = skin_row.date_text
+        if not date_text or date_text == "Unknown" or _is_placeholder_date(date_text):
+            continue
+        for special_skin, special_rows in index.items():
+            if special_skin in skin_row.name:
+                special_rows.append(skin_row)
+    return index
+
+def build_skins_data(skin_rows, registry):
+    champions = registry.names
+    champion_skins = {champion: [] for champion in champions}
+    assigned_names = set()
+
+    for skin_row in skin_rows:
+        skin_name = skin_row.name
+        if not skin_name or skin_name.lower() in ['skin', 'name']:
+            continue
+
+        release_date = skin_row.release_date()
+        skin_champion = _attribute_skin(skin_row, registry)
+
+        if skin_champion:
+            champion_skins[skin_champion].append({
+                'name': skin_name,
+                'release_date': release_date,
+                'release_ordinal': release_ordinal(release_date)
+            })
+            assigned_names.add(skin_name)
+            logging.debug(f"Added skin {skin_name} (Released: {release_date}) to champion {skin_champion}")
+
+    special_rows = _index_special_rows(skin_rows)
+
+    for champion in champions:
+        if champion in champion_skins:
+            for skin_name, champ in SPECIAL_CASES.items():
+                if skin_name in SPECIAL_SKIN_CHAMPIONS and champion not in SPECIAL_SKIN_CHAMPIONS[skin_name]:
+                    continue
+
+                if champ == champion or (champ == "Various" and champion in ["Ezreal", "Lux", "Miss Fortune"]):
+                    full_skin_name = f"{skin_name} {champion}" if skin_name in ["Hextech", "Championship", "Victorious", "Conqueror", "Traditional"] else skin_name
+
+                    should_add = True
+                    for existing_skin in champion_skins[champion]:
+                        existing_name = existing_skin['name']
+                        if (skin_name in existing_name and champion in existing_name):
+                            should_add = False
+                            logging.debug(f"Skipping {skin_name} for {champion} as {existing_name} already exists")
+                            break
+                        if existing_name == skin_name or existing_name == full_skin_name:
+                            should_add = False
+                            break
 
-        header_row = rows[0]
-        header_cells = header_row.find_all(['th'])
+                    if should_add:
+                        # full_skin_name always contains skin_name, so every candidate row is in the index
+                        release_date = "Unknown"
+                        for skin_row in special_rows[skin_name]:
+                            table_skin_name = skin_row.name
 
-        name_idx = None
-        release_idx = None
-        avail_idx = None
+                            if table_skin_name == full_skin_name or champion in table_skin_name:
+                                release_date = skin_row.date_text
+                                logging.debug(f"Found release date '{release_date}' for special skin {full_skin_name}")
+                                break
 
-        for idx, cell in enumerate(header_cells):
-            img_element = cell.find('img')
-            if img_element and 'src' in img_element.attrs:
-                img_src = img_element['src']
-                logging.debug(f"Found image in header cell {idx}: {img_src}")
+                        release_date = parse_date(release_date) if release_date != "Unknown" else "Unknown"
+                        champion_skins[champion].append({
+                            'name': full_skin_name,
+                            'release_date': release_date,
+                            'release_ordinal': release_ordinal(release_date)
+                        })
+                        assigned_names.add(full_skin_name)
+                        logging.debug(f"Added special case skin {full_skin_name} to champion {champion} with release date {release_date}")
 
-                if 'Release.png' in img_src:
-                    release_idx = idx
-                    logging.debug(f"Found Release column at index {idx}")
+    other_skins = []
 
-                elif 'Availability.png' in img_src:
-                    avail_idx = idx
-                    logging.debug(f"Found Availability column at index {idx}")
+    for skin_row in skin_rows:
+        skin_name = skin_row.name
+        if not skin_name or skin_name in assigned_names:
+            continue
 
-            cell_text = cell.get_text(strip=True).lower()
-            logging.debug(f"Header cell {idx}: '{cell_text}'")
-            if 'skin' in cell_text or 'name' in cell_text:
-                name_idx = idx
-            elif 'release' in cell_text and release_idx is None:
-                release_idx = idx
-            elif 'availab' in cell_text and avail_idx is None:
-                avail_idx = idx
+        release_date = "Unknown"
+        date_text = skin_row.date_text
+        if date_text and not _is_placeholder_date(date_text):
+            release_date = parse_date(date_text)
 
-        if name_idx is None:
-            name_idx = 1
-        if release_idx is None:
-            release_idx = 2
-        if avail_idx is None and release_idx == 2:
-            avail_idx = 3
+        other_skins.append({
+            'name': skin_name,
+            'release_date': release_date,
+            'release_ordinal': release_ordinal(release_date)
+        })
+        logging.debug(f"Added skin {skin_name} to 'Other' category")
 
-        logging.debug(f"Using column {name_idx} for skin names and column {release_idx} for release dates")
+    if other_skins:
+        champion_skins["Other"] = other_skins
 
-        for row in rows[1:]:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) <= max(name_idx, release_idx):
-                continue
+    champion_skins = {k: v for k, v in champion_skins.items() if v}
 
-            skin_name = cells[name_idx].get_text(strip=True)
-            if not skin_name or skin_name.lower() in ['skin', 'name']:
-                continue
+    with _view_lock:
+        custom_mappings = dict(CUSTOM_SKIN_MAPPINGS)
+    sort_champion_skins(champion_skins, custom_mappings)
 
-            release_date = "Unknown"
-            if release_idx < len(cells):
-                release_cell = cells[release_idx]
-
-                date_links = release_cell.find_all('a')
-                for link in date_links:
-                    link_text = link.get_text(strip=True)
-                    if re.match(r'\d{1,2}-[A-Za-z]{3}-\d{4}', link_text):
-                        release_date = link_text
-                        logging.debug(f"Found linked release date '{link_text}' for skin {skin_name}")
-                        break
+    logging.debug(f"Successfully categorized skins for {len(champion_skins)} champions")
+    return champion_skins
 
-                if release_date == "Unknown":
-                    date_text = release_cell.get_text(strip=True)
-                    if date_text and date_text.lower() != 'unknown' and not all(c in "✔⭐⭘‒" for c in date_text):
-                        date_text = re.sub(r'\([^)]*\)', '', date_text).strip()
-                        if date_text:
-                            release_date = date_text
-                            logging.debug(f"Found text release date '{date_text}' for skin {skin_name}")
-
-                if release_date == "Unknown":
-                    elements_with_data = release_cell.select('[title], [data-sort-value]')
-                    for element in elements_with_data:
-                        if 'title' in element.attrs and re.search(r'\d{4}', element['title']):
-                            release_date = element['title']
-                            logging.debug(f"Found date in title attribute: '{release_date}' for skin {skin_name}")
-                            break
-                        elif 'data-sort-value' in element.attrs and re.search(r'\d{4}', element['data-sort-value']):
-                            release_date = element['data-sort-value']
-                            logging.debug(f"Found date in data-sort-value: '{release_date}' for skin {skin_name}")
-                            break
+SKINS_TTL = int(os.environ.get('SKINS_TTL', 3600))
 
-                logging.debug(f"Final release date '{release_date}' for skin {skin_name}")
-
-                champion_cell_text = ""
-                if len(cells) > 0:
-                    champion_cell_text = cells[0].get_text(strip=True)
-                    logging.debug(f"Champion cell contains: '{champion_cell_text}' for skin {skin_name}")
-
-                skin_champion = None
-
-                if len(cells) > 0:
-                    champion_cell = cells[0].get_text(strip=True)
-                    if champion_cell in champions:
-                        skin_champion = champion_cell
-
-                champion_nicknames = {
-                    "Emumu": "Amumu",
-                    "MF": "Miss Fortune",
-                    "TF": "Twisted Fate",
-                    "ASol": "Aurelion Sol",
-                    "Cass": "Cassiopeia",
-                    "Mundo": "Dr. Mundo",
-                    "Fiddle": "Fiddlesticks",
-                    "GP": "Gangplank",
-                    "J4": "Jarvan IV",
-                    "Kai": "Kai'Sa",
-                    "Kass": "Kassadin",
-                    "Kat": "Katarina",
-                    "Malph": "Malphite",
-                    "Yi": "Master Yi",
-                    "Morde": "Mordekaiser",
-                    "Nunu": "Nunu & Willump",
-                    "Raka": "Soraka",
-                    "Tahm": "Tahm Kench",
-                    "Vlad": "Vladimir",
-                    "Xin": "Xin Zhao"
-                }
-
-                if not skin_champion:
-                    for champion in sorted(champions, key=len, reverse=True):
-                        if champion in skin_name or f"{champion}'s" in skin_name:
-                            skin_champion = champion
-                            break
+_skins_cache = None
+_skin_dates = None
+_skins_view = None
+_cache_timestamp = None
+_skins_version = None
+_view_lock = threading.Lock()
+
+def _index_linked_dates(skin_rows):
+    # Lower-cased skin name -> linked release date; later rows win, as they did when
+    # /skins rescanned the page for unmatched custom mappings
+    skin_dates = {}
+    for skin_row in skin_rows:
+        if skin_row.linked_date:
+            skin_dates[skin_row.name.lower()] = skin_row.linked_date
+    return skin_dates
+
+class SkinsView:
+    __slots__ = ('skins', 'potential_matches', 'locations')
+
+    def __init__(self, skins, potential_matches, locations):
+        self.skins = skins
+        self.potential_matches = potential_matches
+        # Skin name -> the category it is listed under; owned by the latest view and only
+        # updated under _view_lock
+        self.locations = locations
+
+def build_skins_view(champion_skins):
+    # Works on a copy: the cached data stays exactly as build_skins_data left it
+    all_skins_data = {category: list(skins) for category, skins in champion_skins.items()}
+
+    for skin_name, champion_name in CUSTOM_SKIN_MAPPINGS.items():
+        found_skin = None
+        found_in_category = None
+
+        for category, skins in all_skins_data.items():
+            for skin in skins:
+                if skin["name"] == skin_name:
+                    found_skin = skin
+                    found_in_category = category
+                    break
+            if found_skin:
+                break
 
-                    partial_name_mappings = {
-                        "urf": "Warwick",
-                        "urfwick": "Warwick",
-                        "alien": "Heimerdinger",
-                        "definitely not": "Blitzcrank",
-                        "festive": "Maokai",
-                        "beemo": "Teemo",
-                        "pug'maw": "Kog'Maw",
-                        "baron": "Nashor",
-                        "poro": "Braum",
-                        "arcade": "Various",
-                        "project": "Various",
-                        "cosmic": "Various",
-                        "dark star": "Various",
-                        "pool party": "Various",
-                        "guardian": "Various"
-                    }
-
-                    if not skin_champion:
-                        skin_lower = skin_name.lower()
-                        for partial, champ in partial_name_mappings.items():
-                            if partial in skin_lower:
-                                if champ != "Various":
-                                    skin_champion = champ
-                                    logging.debug(f"Matched partial name '{partial}' to champion {skin_champion}")
-                                    break
-
-                    if not skin_champion:
-                        skin_parts = skin_name.split()
-                        for part in skin_parts:
-                            if part in champion_nicknames:
-                                skin_champion = champion_nicknames[part]
-                                logging.debug(f"Matched nickname {part} to champion {skin_champion}")
-                                break
+        if found_skin:
+            # Removed before re-adding, so a skin mapped to the bucket it is already in stays listed
+            all_skins_data[found_in_category] = [
+                skin for skin in all_skins_data[found_in_category]
+                if skin["name"] != skin_name
+            ]
 
-                    if not skin_champion:
-                        for special_skin, champ in special_cases.items():
-                            if special_skin in skin_name:
-                                if champ != "Various":
-                                    skin_champion = champ
-                                    logging.debug(f"Matched special case {special_skin} to champion {skin_champion}")
-                                    break
-
-                if skin_champion:
-                    champion_skins[skin_champion].append({
-                        'name': skin_name,
-                        'release_date': release_date
-                    })
-                    logging.debug(f"Added skin {skin_name} (Released: {release_date}) to champion {skin_champion}")
-
-        special_skin_champions = {
-            "Hextech": ["Alistar", "Amumu", "Annie", "Cho'Gath", "Galio", "Janna", "Kog'Maw", "Malzahar", "Nocturne", "Poppy", "Rammus", "Renekton", "Sejuani", "Singed", "Sion", "Swain", "Tristana", "Ziggs", "Jarvan IV", "Ezreal"],
-            "Championship": ["Ashe", "Kalista", "Kha'Zix", "LeBlanc", "Riven", "Shyvana", "Thresh", "Zed", "Zoe"],
-            "Victorious": ["Aatrox", "Blitzcrank", "Elise", "Graves", "Janna", "Jarvan IV", "Lucian", "Maokai", "Morgana", "Orianna", "Sivir"],
-            "Conqueror": ["Alistar", "Jax", "Karma", "Nautilus", "Varus"],
-            "Traditional": ["Lee Sin", "Karma", "Sejuani", "Trundle"]
-        }
-
-        for champion in champions:
-            if champion in champion_skins:
-                for skin_name, champ in special_cases.items():
-                    if skin_name in special_skin_champions and champion not in special_skin_champions[skin_name]:
-                        continue
-
-                    if champ == champion or (champ == "Various" and champion in ["Ezreal", "Lux", "Miss Fortune"]):
-                        full_skin_name = f"{skin_name} {champion}" if skin_name in ["Hextech", "Championship", "Victorious", "Conqueror", "Traditional"] else skin_name
-
-                        should_add = True
-                        for existing_skin in champion_skins[champion]:
-                            existing_name = existing_skin['name']
-                            if (skin_name in existing_name and champion in existing_name):
-                                should_add = False
-                                logging.debug(f"Skipping {skin_name} for {champion} as {existing_name} already exists")
-                                break
-                            if existing_name == skin_name or existing_name == full_skin_name:
-                                should_add = False
-                                break
+            if not all_skins_data[found_in_category]:
+                del all_skins_data[found_in_category]
 
-                        if should_add:
-                            release_date = "Unknown"
-                            for i in range(1, len(rows)):
-                                row = rows[i]
-                                cells = row.find_all(['td', 'th'])
-                                if len(cells) <= max(name_idx, release_idx):
-                                    continue
-
-                                table_skin_name = cells[name_idx].get_text(strip=True)
-
-                                if table_skin_name == full_skin_name or (skin_name in table_skin_name and champion in table_skin_name):
-                                    if release_idx < len(cells):
-                                        date_cell = cells[release_idx]
-                                        date_text = date_cell.get_text(strip=True)
-                                        if date_text and date_text != "Unknown" and not all(c in "✔⭐⭘‒" for c in date_text):
-                                            release_date = date_text
-                                            logging.debug(f"Found release date '{date_text}' for special skin {full_skin_name}")
-                                            break
-
-                            champion_skins[champion].append({
-                                'name': full_skin_name,
-                                'release_date': parse_date(release_date) if release_date != "Unknown" else "Unknown"
-                            })
-                            logging.debug(f"Added special case skin {full_skin_name} to champion {champion} with release date {release_date}")
-
-        other_skins = []
-
-        for i in range(1, len(rows)):
-            row = rows[i]
-            cells = row.find_all(['td', 'th'])
-            if len(cells) <= max(name_idx, release_idx):
-                continue
+            if champion_name not in all_skins_data:
+                all_skins_data[champion_name] = []
+            all_skins_data[champion_name].append(found_skin)
+        else:
+            release_date = "Unknown"
+
+            for category, skins_list in all_skins_data.items():
+                for skin in skins_list:
+                    if skin["name"].lower() == skin_name.lower():
+                        release_date = skin["release_date"]
+                        break
 
-            skin_name = cells[name_idx].get_text(strip=True)
-            if not skin_name:
+            if release_date == "Unknown":
+                release_date = get_skin_release_date(skin_name)
+
+            if champion_name not in all_skins_data:
+                all_skins_data[champion_name] = []
+            all_skins_data[champion_name].append({
+                "name": skin_name,
+                "release_date": release_date,
+                "release_ordinal": release_ordinal(release_date)
+            })
+
+    other_matches = {}
+    if "Other" in all_skins_data:
+        skins_to_move = {}
+        other_matches = find_potential_champion_matches_batch(
+            [skin["name"] for skin in all_skins_data["Other"]])
+
+        for skin in all_skins_data["Other"]:
+            if skin["name"] in CUSTOM_SKIN_MAPPINGS:
                 continue
 
-            release_date = "Unknown"
-            if release_idx < len(cells):
-                release_cell = cells[release_idx]
-                date_text = release_cell.get_text(strip=True)
-                if date_text and not all(c in "✔⭐⭘‒" for c in date_text):
-                    release_date = parse_date(date_text)
-
-            found = False
-            for champion, skins in champion_skins.items():
-                if any(skin['name'] == skin_name for skin in skins):
-                    found = True
+            matches = other_matches.get(skin["name"])
+            if matches:
+                best_match, score = matches[0]
+                if score > 2:
+                    if best_match not in skins_to_move:
+                        skins_to_move[best_match] = []
+                    skins_to_move[best_match].append(skin)
+
+        for champion, skins_list in skins_to_move.items():
+            if champion not in all_skins_data:
+                all_skins_data[champion] = []
+            all_skins_data[champion].extend(skins_list)
+
+        moved = {(skin["name"], skin["release_date"]) for skins_list in skins_to_move.values() for skin in skins_list}
+        all_skins_data["Other"] = [skin for skin in all_skins_data["Other"]
+                                   if (skin["name"], skin["release_date"]) not in moved]
+        if not all_skins_data["Other"]:
+            del all_skins_data["Other"]
+
+    potential_matches = {}
+    for skin in all_skins_data.get("Other", []):
+        matches = other_matches.get(skin["name"])
+        if matches:
+            potential_matches[skin["name"]] = tuple(matches[:3])
+
+    skins = {
+        category: tuple(MappingProxyType(dict(skin)) for skin in skins_list)
+        for category, skins_list in all_skins_data.items()
+    }
+    locations = {}
+    for category, skins_list in skins.items():
+        for skin in skins_list:
+            locations.setdefault(skin["name"], category)
+    return SkinsView(MappingProxyType(skins), MappingProxyType(potential_matches), locations)
+
+def _reassign_in_view(view, skin_name, champion_name):
+    # Moves one skin the way build_skins_view would place it. Only the source and target
+    # buckets are rebuilt; every other bucket is shared with the previous view.
+    category = view.locations.get(skin_name)
+    if category == champion_name:
+        return view
+
+    skins = dict(view.skins)
+    potential_matches = view.potential_matches
+
+    if category is not None:
+        bucket = skins[category]
+        record = next(skin for skin in bucket if skin["name"] == skin_name)
+        remaining = tuple(skin for skin in bucket if skin["name"] != skin_name)
+        if remaining:
+            skins[category] = remaining
+        else:
+            del skins[category]
+        if skin_name in potential_matches:
+            potential_matches = {name: matches for name, matches in potential_matches.items() if name != skin_name}
+    else:
+        release_date = "Unknown"
+        skin_lower = skin_name.lower()
+        for skins_list in skins.values():
+            for skin in skins_list:
+                if skin["name"].lower() == skin_lower:
+                    release_date = skin["release_date"]
                     break
+            if release_date != "Unknown":
+                break
+
+        if release_date == "Unknown":
+            release_date = get_skin_release_date(skin_name)
+
+        record = MappingProxyType({
+            "name": skin_name,
+            "release_date": release_date,
+            "release_ordinal": release_ordinal(release_date)
+        })
+
+    skins[champion_name] = skins.get(champion_name, ()) + (record,)
+
+    if champion_name == "Other":
+        matches = find_potential_champion_matches_batch([skin_name]).get(skin_name)
+        if matches:
+            potential_matches = dict(potential_matches)
+            potential_matches[skin_name] = tuple(matches[:3])
+
+    view.locations[skin_name] = champion_name
+    return SkinsView(MappingProxyType(skins), MappingProxyType(potential_matches), view.locations)
+
+def _apply_skin_mapping(skin_name, champion_name):
+    global _skins_view
+    with _view_lock:
+        CUSTOM_SKIN_MAPPINGS[skin_name] = champion_name
+        if _skins_view is not None:
+            _skins_view = _reassign_in_view(_skins_view, skin_name, champion_name)
+
+def _sync_skin_mappings():
+    # Picks up assignments journaled by other workers. Our own are already applied, and
+    # replaying the journal in order means the last assignment of a skin wins everywhere.
+    for skin_name, champion_name in mapping_journal.journal.read_new():
+        if CUSTOM_SKIN_MAPPINGS.get(skin_name) != champion_name:
+            _apply_skin_mapping(skin_name, champion_name)
+
+def assign_skin(skin_name, champion_name):
+    # Journaled first so the assignment survives restarts and reaches the other workers;
+    # returns whether that succeeded. The in-memory view is updated either way.
+    persisted = mapping_journal.journal.append(skin_name, champion_name)
+    _apply_skin_mapping(skin_name, champion_name)
+    return persisted
+
+def get_skins_view():
+    global _skins_view
+    champion_skins = get_all_skins_data()
+    if not champion_skins:
+        return None
+
+    if _skins_view is None:
+        with _view_lock:
+            if _skins_view is None:
+                _skins_view = build_skins_view(champion_skins)
+                logging.debug("Rebuilt skins view from cached skins data")
+    _sync_skin_mappings()
+    return _skins_view
+
+def refresh_skins_data():
+    # The skins page is several megabytes; concurrent cold readers and the refresher share one load
+    return flights.do('skins', _load_skins_data)
+
+def _load_skins_data():
+    global _skins_cache, _skin_dates, _skins_view, _cache_timestamp, _skins_version
+
+    try:
+        registry = champion_registry.snapshot()
 
-            if not found:
-                other_skins.append({
-                    'name': skin_name,
-                    'release_date': release_date
-                })
-                logging.debug(f"Added skin {skin_name} to 'Other' category")
+        url = "https://wiki.leagueoflegends.com/en-us/List_of_champion_skins"
+        logging.debug(f"Fetching all skins data from: {url}")
 
-        if other_skins:
-            champion_skins["Other"] = other_skins
+        page = fetcher.fetch_parsed(url, parse_skins_table, timeout=10)
+        if page.status_code != 200:
+            logging.error(f"Failed to fetch skins data, status code: {page.status_code}")
+            return False
 
-        champion_skins = {k: v for k, v in champion_skins.items() if v}
+        skin_rows = page.value
+        if skin_rows is None:
+            return False
 
-        for champion in champion_skins:
-            try:
-                def sort_key(x):
-                    date = x['release_date']
-
-                    if champion in CUSTOM_SKIN_MAPPINGS.values() and x['name'] in CUSTOM_SKIN_MAPPINGS.keys():
-                        if date != "Unknown" and re.search(r'\d{1,2}-[A-Za-z]{3}-\d{4}', date):
-                            match = re.search(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})', date)
-                            if match:
-                                day, month, year = match.groups()
-                                month_map = {
-                                    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                                    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                                }
-                                return datetime(int(year), month_map.get(month, 1), int(day))
-                        return datetime(2023, 1, 1)
-
-                    if date == "Unknown":
-                        return datetime.min
-
-                    if re.search(r'\d{1,2}-[A-Za-z]{3}-\d{4}', date):
-                        match = re.search(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})', date)
-                        if match:
-                            day, month, year = match.groups()
-                            month_map = {
-                                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                            }
-                            return datetime(int(year), month_map.get(month, 1), int(day))
-
-                    year_match = re.search(r'\b(20\d\d|19\d\d)\b', date)
-                    if year_match:
-                        try:
-                            year = int(year_match.group(1))
-
-                            month_match = re.search(r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b', date, re.IGNORECASE)
-                            month = 1
-                            if month_match:
-                                month_name = month_match.group(1).lower()
-                                months = {
-                                    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3, 
-                                    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7, 
-                                    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10, 
-                                    'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-                                }
-                                month = months.get(month_name, 1)
-
-                            day = 1
-                            day_match = re.search(r'\b(\d{1,2})(st|nd|rd|th)?\b', date)
-                            if day_match:
-                                day = int(day_match.group(1))
-
-                            return datetime(year, month, day)
-                        except (ValueError, OverflowError):
-                            logging.warning(f"Couldn't create date object from: {date}")
-                            return datetime.min
-
-                    return datetime.min
-
-                champion_skins[champion].sort(key=sort_key, reverse=True)
-            except Exception as e:
-                logging.error(f"Error sorting skins for {champion}: {e}")
-
-        logging.debug(f"Successfully categorized skins for {len(champion_skins)} champions")
+        champion_skins = build_skins_data(skin_rows, registry)
 
         _skins_cache = champion_skins
-        _cache_timestamp = current_time
-
-        return champion_skins
+        _skin_dates = _index_linked_dates(skin_rows)
+        with _view_lock:
+            _skins_view = build_skins_view(champion_skins)
+        _cache_timestamp = datetime.now()
+        _skins_version = snapshot_store.publish('skins', {'skins': champion_skins, 'dates': _skin_dates})
+        return True
 
     except Exception as e:
         logging.error(f"Error fetching skin data: {e}")
-        return {}
+        return False
+
+def _adopt_shared_skins():
+    global _skins_cache, _skin_dates, _skins_view, _cache_timestamp, _skins_version
+
+    shared = snapshot_store.latest('skins')
+    if shared is None or shared.version == _skins_version:
+        return
+
+    with _view_lock:
+        if shared.version == _skins_version:
+            return
+        # The view is derived per worker, once per published version
+        _skins_cache = shared.value['skins']
+        _skin_dates = shared.value['dates']
+        _skins_view = build_skins_view(_skins_cache)
+        _cache_timestamp = datetime.fromtimestamp(shared.written_at)
+        _skins_version = shared.version
+    logging.debug(f"Adopted shared skins snapshot version {shared.version}")
+
+def get_all_skins_data():
+    _adopt_shared_skins()
+    champion_skins = _skins_cache
+    if champion_skins is None:
+        if not refresh_skins_data():
+            return {}
+        return _skins_cache
+
+    # A stale table is still served; the refresher swaps in a new one when it lands
+    if (datetime.now() - _cache_timestamp).total_seconds() > SKINS_TTL:
+        refresher.trigger('skins')
+    else:
+        logging.debug("Using cached skins data")
+    return champion_skins
+
+def reset_caches():
+    # Drops everything derived from the skins page, so the next read starts cold
+    global _skins_cache, _skin_dates, _skins_view, _cache_timestamp, _skins_version, _attributor, _matcher
+    with _view_lock:
+        _skins_cache = None
+        _skin_dates = None
+        _skins_view = None
+        _cache_timestamp = None
+        _skins_version = None
+    _attributor = None
+    _matcher = None
+    parse_date.cache_clear()
+    _date_ordinal.cache_clear()
+
+def get_skin_release_date(skin_name):
+    skin_dates = _skin_dates
+    if skin_dates is None:
+        return "Unknown"
+    return skin_dates.get(skin_name.lower(), "Unknown")
 
 def get_champion_skins(champion_name):
     try:
@@ -478,90 +800,89 @@ CUSTOM_SKIN_MAPPINGS = {
     "Mr. Mundoverse": "Dr. Mundo"
 }
 
-def find_potential_champion_matches(skin_name):
-    try:
-        if skin_name in CUSTOM_SKIN_MAPPINGS:
-            return [(CUSTOM_SKIN_MAPPINGS[skin_name], 100)]
-
-        champions = get_champions_list()
-        matches = []
-
-        skin_lower = skin_name.lower()
+# Assignments made through /assign_skin_champion, in the order they were made
+CUSTOM_SKIN_MAPPINGS.update(mapping_journal.journal.read_new())
 
-        common_prefixes = ["hextech ", "project: ", "arcade ", "pool party ", "battle ", "cosmic ", 
+MATCH_COMMON_PREFIXES = ["hextech ", "project: ", "arcade ", "pool party ", "battle ", "cosmic ", 
                          "dark star ", "blood moon ", "spirit blossom ", "project ", "elderwood ",
                          "snowdown ", "lunar wraith ", "championship ", "victorious ", "conqueror ",
                          "bee", "beez", "pug'", "meow", "snow", "nutcrack", "bro", "lolli"]
 
-        clean_skin_name = skin_lower
-        for prefix in common_prefixes:
-            if clean_skin_name.startswith(prefix):
-                clean_skin_name = clean_skin_name[len(prefix):]
-                break
+MATCH_NICKNAMES = {
+    "cass": "cassiopeia",
+    "ali": "alistar",
+    "asol": "aurelion sol",
+    "mf": "miss fortune",
+    "tf": "twisted fate",
+    "j4": "jarvan iv",
+    "mundo": "dr. mundo",
+    "ww": "warwick",
+    "nunu": "nunu & willump",
+
+    "beez": "blitzcrank",
+    "bee": "vel'koz",
+    "kitta": "nidalee",
+    "batnivia": "anivia",
+    "maw": "kog'maw",
+    "stinger": "heimerdinger",
+    "merdinger": "heimerdinger",
+    "anna": "orianna",
+    "glasc": "renata glasc",
+    "yuubee": "yuumi",
+    "bear": "volibear",
+    "meowrick": "yorick",
+    "birdio": "galio",
+    "toy": "renekton",
+    "meowkai": "maokai",
+    "cracko": "shaco",
+    "olaf": "olaf",
+    "poppy": "poppy",
+    "crabgot": "urgot",
+    "mundoverse": "dr. mundo"
+}
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_champion_matcher():
+    global _matcher
+    snapshot = champion_registry.snapshot()
+    matcher = _matcher
+    if matcher is None or matcher.version != snapshot.version:
+        with _matcher_lock:
+            if _matcher is None or _matcher.version != snapshot.version:
+                _matcher = ChampionMatcher(snapshot, MATCH_NICKNAMES, MATCH_COMMON_PREFIXES)
+                logging.debug(f"Built champion matcher for registry version {snapshot.version}")
+            matcher = _matcher
+    return matcher
 
-        nickname_map = {
-            "cass": "cassiopeia",
-            "ali": "alistar",
-            "asol": "aurelion sol",
-            "mf": "miss fortune",
-            "tf": "twisted fate",
-            "j4": "jarvan iv",
-            "mundo": "dr. mundo",
-            "ww": "warwick",
-            "nunu": "nunu & willump",
-
-            "beez": "blitzcrank",
-            "bee": "vel'koz",
-            "kitta": "nidalee",
-            "batnivia": "anivia",
-            "maw": "kog'maw",
-            "stinger": "heimerdinger",
-            "merdinger": "heimerdinger",
-            "anna": "orianna",
-            "glasc": "renata glasc",
-            "yuubee": "yuumi",
-            "bear": "volibear",
-            "meowrick": "yorick",
-            "birdio": "galio",
-            "toy": "renekton",
-            "meowkai": "maokai",
-            "cracko": "shaco",
-            "olaf": "olaf",
-            "poppy": "poppy",
-            "crabgot": "urgot",
-            "mundoverse": "dr. mundo"
-        }
-
-        for champion in champions:
-            champion_lower = champion.lower()
-            score = 0
-
-            if champion_lower in clean_skin_name:
-                if re.search(r'\b' + re.escape(champion_lower) + r'\b', clean_skin_name):
-                    score += 10
-                else:
-                    score += 5
-
-            champion_words = champion_lower.split()
-            for word in champion_words:
-                if len(word) > 2 and word in clean_skin_name:
-                    score += 3
-
-            if champion_lower.replace("'", "").replace(" ", "") in clean_skin_name.replace(" ", ""):
-                score += 2
-
-            for nickname, champ in nickname_map.items():
-                if nickname in skin_lower and champ == champion_lower:
-                    score += 5
-
-            if any(pattern in skin_lower for pattern in [f"{champion_lower.replace(' ', '')}", 
-                                                      f"{champion_lower[:4]}"]):
-                score += 3
-
-            if score > 0:
-                matches.append((champion, score))
-
-        return sorted(matches, key=lambda x: x[1], reverse=True)
+def find_potential_champion_matches(skin_name):
+    try:
+        if skin_name in CUSTOM_SKIN_MAPPINGS:
+            return [(CUSTOM_SKIN_MAPPINGS[skin_name], 100)]
+
+        return get_champion_matcher().score(skin_name)
     except Exception as e:
         logging.error(f"Error finding champion matches for skin {skin_name}: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def find_potential_champion_matches_batch(skin_names):
+    try:
+        matcher = get_champion_matcher()
+    except Exception as e:
+        logging.error(f"Error building champion matcher: {e}")
+        return {skin_name: [] for skin_name in skin_names}
+
+    results = {}
+    for skin_name in skin_names:
+        if skin_name in CUSTOM_SKIN_MAPPINGS:
+            results[skin_name] = [(CUSTOM_SKIN_MAPPINGS[skin_name], 100)]
+            continue
+        try:
+            results[skin_name] = matcher.score(skin_name)
+        except Exception as e:
+            logging.error(f"Error finding champion matches for skin {skin_name}: {e}")
+            results[skin_name] = []
+    return results
+
+refresher.register('skins', refresh_skins_data, SKINS_TTL)
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import disk_cache
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# Off by default: a single process keeps everything in its own memory. With several workers,
+# one of them is elected writer and runs the refresher; the rest read what it publishes.
+#
+# Supported servers: the threaded Flask dev server (reloader included), and gunicorn sync or
+# threaded workers with or without --preload. With SHARED_SNAPSHOTS nothing is elected at
+# import time: each serving process calls main.start_background_refresh() on its first
+# request, always after any fork. To warm a worker before that, call it from gunicorn's
+# post_worker_init hook. Writer state and the database connection belong to the process
+# that created them, and a forked child never inherits either.
+SHARED_SNAPSHOTS = os.environ.get('SHARED_SNAPSHOTS', '0') == '1'
+SNAPSHOT_POLL_INTERVAL = float(os.environ.get('SNAPSHOT_POLL_INTERVAL', 1.0))
+WRITER_RETRY = int(os.environ.get('SNAPSHOT_WRITER_RETRY', 30))
+SNAPSHOT_DB_FILE = 'snapshots.sqlite3'
+WRITER_LOCK_FILE = 'snapshots.writer.lock'
+
+
+class Snapshot:
+    __slots__ = ('version', 'written_at', 'value')
+
+    def __init__(self, version, written_at, value):
+        self.version = version
+        self.written_at = written_at
+        self.value = value
+
+
+class SnapshotStore:
+    def __init__(self, path, poll_interval=SNAPSHOT_POLL_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._data_version = None
+        self._checked_at = None
+        self._versions = {}
+        self._loaded = {}
+
+    def _connection(self):
+        # SQLite connections must not cross a fork; a child opens its own
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            # WAL lets readers keep reading the previous version while a new one is committed
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS snapshots ('
+                         'name TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+                         'written_at REAL NOT NULL, payload TEXT NOT NULL)')
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+            self._data_version = None
+            self._checked_at = None
+        return self._conn
+
+    def publish(self, name, value):
+        payload = json.dumps(value)
+        written_at = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    row = conn.execute('SELECT version FROM snapshots WHERE name = ?', (name,)).fetchone()
+                    version = (row[0] if row else 0) + 1
+                    conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)',
+                                 (name, version, written_at, payload))
+                self._versions[name] = version
+                self._loaded[name] = Snapshot(version, written_at, value)
+        except sqlite3.Error as e:
+            logging.error(f"Error publishing snapshot {name}: {e}")
+            return None
+
+        logging.debug(f"Published snapshot {name} version {version} ({len(payload)} bytes)")
+        return version
+
+    def get(self, name):
+        try:
+            with self._lock:
+                conn = self._connection()
+                now = self._clock()
+                if self._checked_at is None or now - self._checked_at >= self.poll_interval:
+                    self._checked_at = now
+                    # data_version only moves when another connection commits, so an idle
+                    # store costs one pragma per poll interval and nothing per request
+                    data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+                    if data_version != self._data_version:
+                        self._data_version = data_version
+                        self._versions = dict(conn.execute('SELECT name, version FROM snapshots'))
+
+                version = self._versions.get(name)
+                if version is None:
+                    return None
+
+                snapshot = self._loaded.get(name)
+                if snapshot is None or snapshot.version != version:
+                    row = conn.execute('SELECT version, written_at, payload FROM snapshots WHERE name = ?',
+                                       (name,)).fetchone()
+                    if row is None:
+                        return None
+                    snapshot = Snapshot(row[0], row[1], json.loads(row[2]))
+                    self._versions[name] = snapshot.version
+                    self._loaded[name] = snapshot
+                return snapshot
+        except (sqlite3.Error, ValueError) as e:
+            logging.error(f"Error reading snapshot {name}: {e}")
+            return None
+
+    def versions(self):
+        with self._lock:
+            return dict(self._versions)
+
+
+store = SnapshotStore(disk_cache.cache_path(SNAPSHOT_DB_FILE)) if SHARED_SNAPSHOTS else None
+_writer_pid = None
+_writer_lock_file = None
+
+def is_writer():
+    # Checked by pid: a child forked from the writer shares its lock but was never elected
+    return store is None or _writer_pid == os.getpid()
+
+def publish(name, value):
+    # Only the elected writer publishes; everywhere else this is a no-op
+    if store is None or not is_writer():
+        return None
+    return store.publish(name, value)
+
+def latest(name):
+    # Readers get the writer's newest snapshot; the writer already holds its own data in memory
+    if store is None or is_writer():
+        return None
+    return store.get(name)
+
+def _try_claim_writer():
+    global _writer_pid, _writer_lock_file
+    if fcntl is None:
+        logging.warning("fcntl unavailable, every process will refresh and publish its own snapshots")
+        _writer_pid = os.getpid()
+        return True
+
+    path = disk_cache.cache_path(WRITER_LOCK_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_file = open(path, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+
+    # The lock is held for the life of the process and released by the OS if it dies
+    _writer_lock_file = lock_file
+    _writer_pid = os.getpid()
+    return True
+
+def elect_writer(on_elected):
+    # Calls on_elected() in the process that becomes the writer; the others keep retrying so a
+    # replacement takes over when the writer exits
+    if is_writer() or _try_claim_writer():
+        logging.info(f"Process {os.getpid()} is the snapshot writer")
+        on_elected()
+        return True
+
+    def run():
+        while not _try_claim_writer():
+            time.sleep(WRITER_RETRY)
+        logging.info(f"Process {os.getpid()} took over as snapshot writer")
+        on_elected()
+
+    threading.Thread(target=run, name='snapshot-writer-election', daemon=True).start()
+    return False
+
+def status():
+    return {
+        'shared': store is not None,
+        'writer': is_writer(),
+        'pid': os.getpid(),
+        'versions': store.versions() if store is not None else {},
+    }
@@ -0,0 +1,27 @@
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    _DEFAULT_BACKEND = 'lxml'
+except ImportError:
+    _DEFAULT_BACKEND = 'html.parser'
+
+BACKEND = os.environ.get('HTML_PARSER_BACKEND', _DEFAULT_BACKEND)
+
+def _any_class(*classes):
+    # While strained, attributes are still raw strings ("sortable article-table"), so a
+    # plain class list would only match exact values; the regex works for both forms
+    return re.compile(r'(?:^|\s)(?:' + '|'.join(re.escape(c) for c in classes) + r')(?:\s|$)')
+
+# Each scraper reads a single kind of element, so the tree is only built for that
+# element and its descendants; navigation, scripts and footers are skipped
+SKINS_TABLE = SoupStrainer('table', {'class': _any_class('sortable', 'article-table', 'nopadding')})
+SEASON_TABLES = SoupStrainer('table', {'class': _any_class('sortable', 'article-table')})
+PARSER_OUTPUT = SoupStrainer('div', {'class': _any_class('mw-parser-output')})
+CATEGORY_GROUPS = SoupStrainer('div', {'class': _any_class('mw-category-group')})
+
+def parse(content, only=None, backend=None):
+    return BeautifulSoup(content, backend or BACKEND, parse_only=only)
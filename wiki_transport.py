@@ -0,0 +1,420 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import disk_cache
+
+# live: talk to the wiki. record: talk to the wiki and save every response as a fixture.
+# replay: answer from fixtures without a network. standin: send everything to a stand-in server.
+WIKI_TRANSPORT = os.environ.get('WIKI_TRANSPORT', 'live')
+WIKI_FIXTURES = os.environ.get('WIKI_FIXTURES', disk_cache.cache_path('wiki_fixtures'))
+WIKI_STANDIN_URL = os.environ.get('WIKI_STANDIN_URL', 'http://127.0.0.1:8765')
+# Injected per response in replay mode and by the stand-in server: latency plus up to jitter seconds
+WIKI_LATENCY = float(os.environ.get('WIKI_LATENCY', 0))
+WIKI_LATENCY_JITTER = float(os.environ.get('WIKI_LATENCY_JITTER', 0))
+
+# Only headers that still describe the stored (decoded) body are kept
+_RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def page_key(url):
+    # Fixtures are keyed by path and query only, so one set serves the wiki, a stand-in
+    # on any port, and quoted or unquoted spellings of the same title
+    parts = urlsplit(url)
+    return unquote(parts.path) + (f"?{parts.query}" if parts.query else "")
+
+
+class Fixture:
+    __slots__ = ('url', 'status', 'headers', 'body', 'etag')
+
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = headers.get('ETag') or '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class FixtureStore:
+    def __init__(self, directory):
+        # One <name>.json (url, status, headers) and one <name>.body per page
+        self.directory = directory
+        self._fixtures = {}
+        self._lock = threading.Lock()
+
+    def _name(self, key):
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '_', key).strip('_')[:80]
+        return f"{slug}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]}"
+
+    def get(self, url):
+        key = page_key(url)
+        with self._lock:
+            if key in self._fixtures:
+                return self._fixtures[key]
+
+        name = os.path.join(self.directory, self._name(key))
+        try:
+            with open(name + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(name + '.body', 'rb') as f:
+                body = f.read()
+            fixture = Fixture(meta['url'], meta['status'], meta['headers'], body)
+        except FileNotFoundError:
+            fixture = None
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Error reading fixture for {key}: {e}")
+            fixture = None
+
+        with self._lock:
+            self._fixtures[key] = fixture
+        return fixture
+
+    def put(self, url, status, headers, body):
+        key = page_key(url)
+        headers = {name: headers[name] for name in _RECORDED_HEADERS if name in headers}
+        name = self._name(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Body before metadata: a fixture is only visible once both are complete
+            self._write(name + '.body', body)
+            meta = {'url': url, 'status': status, 'headers': headers}
+            self._write(name + '.json', json.dumps(meta, indent=1).encode('utf-8'))
+        except OSError as e:
+            logging.error(f"Error writing fixture for {key}: {e}")
+            return None
+
+        fixture = Fixture(url, status, headers, body)
+        with self._lock:
+            self._fixtures[key] = fixture
+        return fixture
+
+    def _write(self, filename, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{filename[:40]}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def urls(self):
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+        except FileNotFoundError:
+            return []
+        urls = []
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    urls.append(json.load(f)['url'])
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Error reading fixture {name}: {e}")
+        return urls
+
+
+class PageStore:
+    # In-memory pages ({path: html}) behind the FixtureStore lookup interface
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url):
+        key = page_key(url)
+        body = self.pages.get(key)
+        if body is None:
+            return None
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return Fixture(key, 200, {'Content-Type': 'text/html; charset=utf-8'}, body)
+
+
+class TransportStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.not_modified = 0
+            self.missing = 0
+            self.bytes = 0
+            self.pages = Counter()
+
+    def record(self, url, status, size):
+        with self._lock:
+            self.requests += 1
+            self.pages[page_key(url)] += 1
+            if status == 304:
+                self.not_modified += 1
+            elif status == 404:
+                self.missing += 1
+            self.bytes += size
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'missing': self.missing,
+                'bytes': self.bytes,
+                'pages': len(self.pages),
+                'max_per_page': max(self.pages.values(), default=0),
+            }
+
+
+# Every upstream request the process makes, whatever the transport
+stats = TransportStats()
+
+
+def _delay(latency, jitter):
+    if latency or jitter:
+        time.sleep(latency + random.uniform(0, jitter))
+
+
+class LiveAdapter(HTTPAdapter):
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        stats.record(request.url, response.status_code, int(response.headers.get('Content-Length') or 0))
+        return response
+
+
+class RecordingAdapter(LiveAdapter):
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        url = request.url
+        response = super().send(request, **kwargs)
+        # A 304 answers our own validators and says nothing new about the page
+        if response.status_code in (200, 404):
+            self.store.put(url, response.status_code, response.headers, response.content)
+        return response
+
+
+class RedirectAdapter(LiveAdapter):
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        # Same path and query, different host
+        parts = urlsplit(request.url)
+        request.url = self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, store, latency=WIKI_LATENCY, jitter=WIKI_LATENCY_JITTER):
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+
+    def send(self, request, **kwargs):
+        _delay(self.latency, self.jitter)
+        fixture = self.store.get(request.url)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        if fixture is None:
+            logging.warning(f"No fixture recorded for {request.url}")
+            response.status_code = 404
+            response.reason = 'Not Found'
+            response._content = b''
+        elif fixture.status == 200 and request.headers.get('If-None-Match') == fixture.etag:
+            response.status_code = 304
+            response.reason = 'Not Modified'
+            response.headers = CaseInsensitiveDict({'ETag': fixture.etag})
+            response._content = b''
+        else:
+            response.status_code = fixture.status
+            response.reason = 'OK' if fixture.status == 200 else ''
+            response.headers = CaseInsensitiveDict(fixture.headers)
+            response.headers['ETag'] = fixture.etag
+            response.headers['Content-Length'] = str(len(fixture.body))
+            response._content = fixture.body
+        response.encoding = get_encoding_from_headers(response.headers)
+
+        stats.record(request.url, response.status_code, len(response._content))
+        return response
+
+    def close(self):
+        pass
+
+
+def make_adapter(mode=WIKI_TRANSPORT, pool_maxsize=10):
+    pool = {'pool_connections': 4, 'pool_maxsize': pool_maxsize}
+    if mode == 'live':
+        return LiveAdapter(**pool)
+    if mode == 'record':
+        return RecordingAdapter(FixtureStore(WIKI_FIXTURES), **pool)
+    if mode == 'replay':
+        return ReplayAdapter(FixtureStore(WIKI_FIXTURES))
+    if mode == 'standin':
+        return RedirectAdapter(WIKI_STANDIN_URL, **pool)
+    raise ValueError(f"Unknown WIKI_TRANSPORT {mode!r}; expected live, record, replay or standin")
+
+
+class StandInServer:
+    # A local HTTP server answering wiki URLs from a FixtureStore or PageStore, with ETags
+    def __init__(self, store, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.hits = 0
+        self.not_modified = 0
+        self.connections = 0
+        self.bytes_sent = 0
+        self.path_hits = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def mount(self, session, origin):
+        # Sends every request for origin to this server instead, keeping the path and query
+        session.mount(origin, RedirectAdapter(self.base_url))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server._lock:
+                    server.hits += 1
+                    server.path_hits[self.path] += 1
+                _delay(server.latency, server.jitter)
+
+                fixture = server.store.get(self.path)
+                if fixture is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if fixture.status == 200 and self.headers.get('If-None-Match') == fixture.etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', fixture.etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(fixture.status)
+                for name, value in fixture.headers.items():
+                    if name != 'ETag':
+                        self.send_header(name, value)
+                self.send_header('Content-Length', str(len(fixture.body)))
+                self.send_header('ETag', fixture.etag)
+                self.end_headers()
+                self.wfile.write(fixture.body)
+                with server._lock:
+                    server.bytes_sent += len(fixture.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='wiki-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record(directory, champions=None):
+    # Drives the scrapers themselves, so the fixture set is exactly the URLs the app asks for.
+    # Every page is fetched outright; nothing is skipped for being cached on disk.
+    import fetcher
+    import patch_data
+    import skin_data
+
+    fetcher.set_adapter(RecordingAdapter(FixtureStore(directory)))
+    names = patch_data.fetch_champions_list() or []
+    fetcher.map_urls(patch_data.fetch_season_dates, patch_data.SEASON_URLS)
+    skin_data.refresh_skins_data()
+    fetcher.map_urls(patch_data.refresh_patch_history, champions or names)
+    return stats.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record wiki fixtures or serve them from a local stand-in")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="Serve recorded fixtures over HTTP")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=int(urlsplit(WIKI_STANDIN_URL).port or 8765))
+    serve.add_argument('--latency', type=float, default=WIKI_LATENCY)
+    serve.add_argument('--jitter', type=float, default=WIKI_LATENCY_JITTER)
+
+    rec = commands.add_parser('record', help="Fetch the live wiki and save every response")
+    rec.add_argument('--champions', nargs='*', help="Patch histories to record (default: every champion)")
+
+    parser.add_argument('--fixtures', default=WIKI_FIXTURES)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'record':
+        result = record(args.fixtures, args.champions)
+        print(f"Recorded {result['pages']} pages ({result['bytes']} bytes) into {args.fixtures}")
+        return
+
+    store = FixtureStore(args.fixtures)
+    server = StandInServer(store, args.host, args.port, args.latency, args.jitter).start()
+    print(f"Serving {len(store.urls())} fixtures from {args.fixtures} at {server.base_url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()